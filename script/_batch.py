@@ -0,0 +1,70 @@
+"""Shared batch driver for the DJ/SJ export scripts.
+
+Each script supplies an analyze(trial, path) callback for its test type; this module
+loads the raw JSON files, skips other test types, writes <stem>_viz.json per trial and
+collects the summary entries in file order.
+"""
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.data import load_trial
+from src.data.types import CMJTrial
+from src.export_viz import export_visualization_json
+
+# analyze(trial, path) -> (viewer payload, summary entry, note appended to the "Wrote" line)
+Analyze = Callable[[CMJTrial, Path], Tuple[Dict[str, Any], Dict[str, Any], str]]
+
+
+def _export_one(
+    path: Path, output_dir: Path, test_type: str, analyze: Analyze
+) -> Tuple[Optional[Dict[str, Any]], str]:
+    """Analyze one file and write its <stem>_viz.json.
+
+    Returns (summary entry, message), or (None, skip reason); the message is returned
+    rather than printed so a worker's output still comes out in file order.
+    """
+    try:
+        trial = load_trial(path)
+    except Exception as e:
+        return None, f"Skip {path.name}: load failed - {e}"
+
+    if (trial.test_type or "").strip().upper() != test_type:
+        return None, f"Skip {path.name}: test_type is not {test_type}"
+
+    payload, entry, note = analyze(trial, path)
+    viz_path = output_dir / f"{path.stem}_viz.json"
+    export_visualization_json(payload, viz_path)
+    return entry, f"Wrote {viz_path}{note}"
+
+
+def export_trials(
+    json_files: List[Path],
+    output_dir: Path,
+    test_type: str,
+    analyze: Analyze,
+    workers: int = 1,
+) -> List[Dict[str, Any]]:
+    """Export every file of test_type; print messages in file order and return the entries.
+
+    workers > 1 runs files in a process pool (analyze must then be a module-level
+    function so it can be pickled); 1 runs everything in-process.
+    """
+    export = partial(_export_one, output_dir=output_dir, test_type=test_type, analyze=analyze)
+    workers = max(1, min(workers, len(json_files)))
+    results: List[Dict[str, Any]] = []
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        outcomes = pool.map(export, json_files) if pool is not None else map(export, json_files)
+        for entry, message in outcomes:
+            if entry is None:
+                print(message, file=sys.stderr)
+            else:
+                print(message)
+                results.append(entry)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return results
@@ -13,18 +13,18 @@ import argparse
 import json
 import sys
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Tuple
 
 # Allow running from project root without PYTHONPATH
 _root = Path(__file__).resolve().parent.parent
 if str(_root) not in sys.path:
     sys.path.insert(0, str(_root))
 
-from src.data import load_trial
-from src.data.types import TrialValidity
+from src.data.types import CMJTrial, TrialValidity
 from src.detect import compute_baseline_drop_jump, detect_drop_jump_events
 from src.detect.drop_jump import compute_dj_metrics
-from src.export_viz import build_dj_visualization_payload, export_visualization_json
+from src.export_viz import build_dj_visualization_payload
+from script._batch import export_trials
 
 
 def _points_to_times(
@@ -40,6 +40,42 @@ def _points_to_times(
     return out
 
 
+def _analyze(trial: CMJTrial, path: Path) -> Tuple[Dict[str, Any], Dict[str, Any], str]:
+    """Detect one DJ trial; return its viewer payload and summary entry."""
+    bodyweight, _, _ = compute_baseline_drop_jump(trial)
+    points, phases = detect_drop_jump_events(
+        trial.force,
+        trial.sample_rate,
+        bodyweight,
+    )
+    validity = TrialValidity(is_valid=True, flags=[])
+    metrics = compute_dj_metrics(
+        trial.force, trial.sample_rate, bodyweight, points, phases
+    )
+
+    payload = build_dj_visualization_payload(
+        trial,
+        bodyweight,
+        points,
+        phases,
+        validity,
+        metrics,
+    )
+
+    pts = points.to_dict()
+    entry = {
+        "file": path.name,
+        "stem": path.stem,
+        "sample_rate": trial.sample_rate,
+        "bodyweight_N": round(float(bodyweight), 2),
+        "points_index": pts,
+        "points_time_s": _points_to_times(pts, trial.sample_rate),
+        "phases": phases.to_dict(),
+        "metrics": metrics,
+    }
+    return payload, entry, ""
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Export raw DJ JSON files to visualization JSON and save detection results"
@@ -56,6 +92,13 @@ def main() -> None:
         default="output",
         help="Output directory for *_viz.json and dj_detection_results.json (default: output)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Worker processes, one trial each at a time; 1 runs in-process (default: 1)",
+    )
     args = parser.parse_args()
 
     root = Path(__file__).resolve().parent.parent
@@ -73,52 +116,7 @@ def main() -> None:
         print(f"No JSON files in {input_dir}", file=sys.stderr)
         sys.exit(0)
 
-    results: List[Dict[str, Any]] = []
-    for path in json_files:
-        try:
-            trial = load_trial(path)
-        except Exception as e:
-            print(f"Skip {path.name}: load failed - {e}", file=sys.stderr)
-            continue
-
-        if (trial.test_type or "").strip().upper() != "DJ":
-            print(f"Skip {path.name}: test_type is not DJ", file=sys.stderr)
-            continue
-
-        bodyweight, _, _ = compute_baseline_drop_jump(trial)
-        points, phases = detect_drop_jump_events(
-            trial.force,
-            trial.sample_rate,
-            bodyweight,
-        )
-        validity = TrialValidity(is_valid=True, flags=[])
-        metrics = compute_dj_metrics(
-            trial.force, trial.sample_rate, bodyweight, points, phases
-        )
-
-        payload = build_dj_visualization_payload(
-            trial,
-            bodyweight,
-            points,
-            phases,
-            validity,
-            metrics,
-        )
-        viz_path = output_dir / f"{path.stem}_viz.json"
-        export_visualization_json(payload, viz_path)
-        print(f"Wrote {viz_path}")
-
-        pts = points.to_dict()
-        results.append({
-            "file": path.name,
-            "stem": path.stem,
-            "sample_rate": trial.sample_rate,
-            "bodyweight_N": round(float(bodyweight), 2),
-            "points_index": pts,
-            "points_time_s": _points_to_times(pts, trial.sample_rate),
-            "phases": phases.to_dict(),
-            "metrics": metrics,
-        })
+    results = export_trials(json_files, output_dir, "DJ", _analyze, args.workers)
 
     if results:
         results_path = output_dir / "dj_detection_results.json"
@@ -12,16 +12,16 @@ import argparse
 import json
 import sys
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Tuple
 
 _root = Path(__file__).resolve().parent.parent
 if str(_root) not in sys.path:
     sys.path.insert(0, str(_root))
 
-from src.data import load_trial
-from src.data.types import TrialValidity
+from src.data.types import CMJTrial, TrialValidity
 from src.detect.squat_jump import run_squat_jump_analysis
-from src.export_viz import build_sj_visualization_payload, export_visualization_json
+from src.export_viz import build_sj_visualization_payload
+from script._batch import export_trials
 
 
 def _serialize_result(result: Dict[str, Any], trial, path: Path) -> Dict[str, Any]:
@@ -54,6 +54,25 @@ def _serialize_result(result: Dict[str, Any], trial, path: Path) -> Dict[str, An
     }
 
 
+def _analyze(trial: CMJTrial, path: Path) -> Tuple[Dict[str, Any], Dict[str, Any], str]:
+    """Detect and classify one SJ trial; return its viewer payload and summary entry."""
+    result = run_squat_jump_analysis(trial)
+    validity = TrialValidity(
+        is_valid=result["validity"]["is_valid"],
+        flags=result["validity"]["flags"],
+    )
+    payload = build_sj_visualization_payload(
+        trial,
+        result["_bodyweight"],
+        result["_points"],
+        validity,
+        result["_metrics_full"],
+        result["flags"],
+        result["classification"],
+    )
+    return payload, _serialize_result(result, trial, path), f"  classification={result['classification']}"
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Export raw SJ JSON files to visualization JSON and detection results"
@@ -70,6 +89,13 @@ def main() -> None:
         default="output",
         help="Output directory for *_viz.json and sj_detection_results.json (default: output)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Worker processes, one trial each at a time; 1 runs in-process (default: 1)",
+    )
     args = parser.parse_args()
 
     root = Path(__file__).resolve().parent.parent
@@ -87,37 +113,7 @@ def main() -> None:
         print(f"No JSON files in {input_dir}", file=sys.stderr)
         sys.exit(0)
 
-    results: List[Dict[str, Any]] = []
-    for path in json_files:
-        try:
-            trial = load_trial(path)
-        except Exception as e:
-            print(f"Skip {path.name}: load failed - {e}", file=sys.stderr)
-            continue
-
-        if (trial.test_type or "").strip().upper() != "SJ":
-            print(f"Skip {path.name}: test_type is not SJ", file=sys.stderr)
-            continue
-
-        result = run_squat_jump_analysis(trial)
-        validity = TrialValidity(
-            is_valid=result["validity"]["is_valid"],
-            flags=result["validity"]["flags"],
-        )
-        payload = build_sj_visualization_payload(
-            trial,
-            result["_bodyweight"],
-            result["_points"],
-            validity,
-            result["_metrics_full"],
-            result["flags"],
-            result["classification"],
-        )
-        viz_path = output_dir / f"{path.stem}_viz.json"
-        export_visualization_json(payload, viz_path)
-        print(f"Wrote {viz_path}  classification={result['classification']}")
-
-        results.append(_serialize_result(result, trial, path))
+    results = export_trials(json_files, output_dir, "SJ", _analyze, args.workers)
 
     if results:
         results_path = output_dir / "sj_detection_results.json"
@@ -1,10 +1,11 @@
 """Entry point: load CMJ JSON, detect events/phases, validate, compute metrics, plot."""
 import argparse
+from dataclasses import replace
 from pathlib import Path
 
-from src.data import load_trial, CMJTrial, CMJEvents
+from src.data import load_trial, CMJEvents
 from src.detect import compute_baseline, detect_events, compute_phases, validate_trial
-from src.physics import compute_kinematics, compute_metrics, compute_asymmetry
+from src.physics import compute_kinematics, compute_metrics, compute_asymmetry, compute_rfd_batch
 from src.viz import plot_force
 from src.export_viz import build_visualization_payload, export_visualization_json
 
@@ -108,18 +109,7 @@ def main() -> None:
 
     if args.filter is not None:
         from src.signal import lowpass_filter
-        force_filtered = lowpass_filter(trial.force, trial.sample_rate, args.filter)
-        trial_analysis = CMJTrial(
-            athlete_id=trial.athlete_id,
-            test_type=trial.test_type,
-            test_duration=trial.test_duration,
-            sample_count=trial.sample_count,
-            force=force_filtered,
-            left_force=trial.left_force,
-            right_force=trial.right_force,
-            sample_rate=trial.sample_rate,
-            t=trial.t,
-        )
+        trial_analysis = replace(trial, force=lowpass_filter(trial.force, trial.sample_rate, args.filter))
     else:
         trial_analysis = trial
 
@@ -147,8 +137,9 @@ def main() -> None:
     if not validity.is_valid:
         print(f"Validity flags: {validity.flags}")
 
-    metrics = compute_metrics(trial_analysis, events, bodyweight=bw, velocity=v)
-    asym = compute_asymmetry(trial_analysis, events)
+    rfd_batch = compute_rfd_batch(trial_analysis)
+    metrics = compute_metrics(trial_analysis, events, bodyweight=bw, velocity=v, rfd_batch=rfd_batch)
+    asym = compute_asymmetry(trial_analysis, events, rfd_batch=rfd_batch)
     for k, val in asym.items():
         metrics[k] = val
 
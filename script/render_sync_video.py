@@ -4,10 +4,15 @@ Composites the source video with a force-vs-time chart; a playhead moves
 in sync with the video. Output is a video file (e.g. MP4) with audio preserved.
 """
 import argparse
+import shutil
+import subprocess
 import sys
 from pathlib import Path
+from typing import List
 
 import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
 # Ensure project root is on path
 ROOT = Path(__file__).resolve().parent.parent
@@ -19,58 +24,206 @@ from src.data.types import CMJTrial
 from src.detect import compute_baseline, detect_events
 
 
-def render_chart_frame(
-    trial: CMJTrial,
-    playhead_time: float,
-    width: int,
-    height: int,
-    dpi: int = 100,
-) -> np.ndarray:
-    """Draw force chart with playhead at playhead_time; return RGB array (H, W, 3)."""
-    import matplotlib
-    matplotlib.use("Agg")
-    import matplotlib.pyplot as plt
-
-    fig_w = width / dpi
-    fig_h = height / dpi
-    fig, ax = plt.subplots(figsize=(fig_w, fig_h), dpi=dpi)
-    fig.patch.set_facecolor("#252525")
-    ax.set_facecolor("#252525")
-
-    ax.plot(trial.t, trial.force, color="white", linewidth=1.5, label="Total force")
-    ax.plot(trial.t, trial.left_force, color="#64b5f6", linewidth=1, linestyle="--", alpha=0.8, label="Left force")
-    ax.plot(trial.t, trial.right_force, color="#e57373", linewidth=1, linestyle="--", alpha=0.8, label="Right force")
-
-    ax.axvline(x=playhead_time, color=(1.0, 0.65, 0.0, 0.9), linewidth=2, linestyle="--")
-
-    ax.set_xlabel("Time (s)", color="#aaa")
-    ax.set_ylabel("Force (N)", color="#aaa")
-    ax.set_title(f"CMJ Force — {trial.athlete_id} ({trial.test_type})", color="#e0e0e0")
-    ax.tick_params(colors="#888")
-    ax.legend(loc="upper right", fontsize=8, labelcolor="#ccc")
-    ax.grid(True, alpha=0.3, color="#444")
-    ax.set_xlim(0, trial.test_duration)
-    for spine in ax.spines.values():
-        spine.set_color("#444")
-
-    fig.tight_layout()
-    fig.canvas.draw()
+def _resize_rgb(buf: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Bilinear resize of an RGB uint8 image to (height, width, 3).
 
+    Uses OpenCV when installed, otherwise Pillow (always present with matplotlib).
+    """
     try:
-        buf = np.frombuffer(fig.canvas.buffer_rgba(), dtype=np.uint8)
-        buf = buf.reshape((*fig.canvas.get_width_height()[::-1], 4))
-        buf = buf[:, :, :3]
+        import cv2
+        return cv2.resize(buf, (width, height), interpolation=cv2.INTER_LINEAR)
+    except ImportError:
+        from PIL import Image
+        return np.asarray(Image.fromarray(buf).resize((width, height), Image.BILINEAR))
+
+
+def _canvas_rgb(canvas: FigureCanvasAgg) -> np.ndarray:
+    """Copy of the Agg canvas as an RGB uint8 array (H, W, 3)."""
+    try:
+        return np.asarray(canvas.buffer_rgba())[..., :3].copy()
     except AttributeError:
-        buf = np.frombuffer(fig.canvas.tostring_rgb(), dtype=np.uint8)
-        buf = buf.reshape((*fig.canvas.get_width_height()[::-1], 3))
-    plt.close(fig)
+        buf = np.frombuffer(canvas.tostring_rgb(), dtype=np.uint8)
+        return buf.reshape((*canvas.get_width_height()[::-1], 3)).copy()
+
+
+class ChartRenderer:
+    """Force chart with a moving playhead, rendered once and composited per frame.
+
+    The chart is static apart from the playhead, so the figure is drawn a single
+    time into an RGB background; each frame only copies that buffer and paints
+    the playhead column with NumPy (no matplotlib in the per-frame path).
+
+    With mpl_playhead=True the playhead is instead a matplotlib artist blitted over
+    the saved background (restore_region + draw_artist), keeping the dashed,
+    anti-aliased style at roughly a millisecond per frame.
+
+    lines="total" plots only total force; "all" adds the left/right force lines.
+    """
+
+    PLAYHEAD_RGB = (255, 165, 0)
+
+    def __init__(
+        self,
+        trial: CMJTrial,
+        width: int,
+        height: int,
+        dpi: int = 100,
+        mpl_playhead: bool = False,
+        lines: str = "total",
+    ) -> None:
+        # Figure + Agg canvas directly (no pyplot figure manager); kept for the renderer's lifetime
+        fig_w = width / dpi
+        fig_h = height / dpi
+        fig = Figure(figsize=(fig_w, fig_h), dpi=dpi)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        fig.patch.set_facecolor("#252525")
+        ax.set_facecolor("#252525")
+
+        ax.plot(trial.t, trial.force, color="white", linewidth=1.5, label="Total force")
+        if lines == "all":
+            ax.plot(trial.t, trial.left_force, color="#64b5f6", linewidth=1, linestyle="--", alpha=0.8, label="Left force")
+            ax.plot(trial.t, trial.right_force, color="#e57373", linewidth=1, linestyle="--", alpha=0.8, label="Right force")
+
+        ax.set_xlabel("Time (s)", color="#aaa")
+        ax.set_ylabel("Force (N)", color="#aaa")
+        ax.set_title(f"CMJ Force — {trial.athlete_id} ({trial.test_type})", color="#e0e0e0")
+        ax.tick_params(colors="#888")
+        ax.legend(loc="upper right", fontsize=8, labelcolor="#ccc")
+        ax.grid(True, alpha=0.3, color="#444")
+        ax.set_xlim(0, trial.test_duration)
+        for spine in ax.spines.values():
+            spine.set_color("#444")
+        # Animated artists are skipped by canvas.draw(), so the background excludes the playhead
+        playhead = ax.axvline(x=0.0, color=(1.0, 0.65, 0.0, 0.9), linewidth=2, linestyle="--", animated=True)
+
+        fig.tight_layout()
+        fig.canvas.draw()
+
+        buf = _canvas_rgb(fig.canvas)
+        canvas_h, canvas_w = buf.shape[:2]
+
+        # Axes extent in pixels (display coords have origin at bottom-left; rows start at top)
+        bbox = ax.get_window_extent()
+        x0, x1 = bbox.x0, bbox.x1
+        y0, y1 = canvas_h - bbox.y1, canvas_h - bbox.y0
+
+        # Resize to exact (height, width) if canvas rounding missed by a pixel or two
+        if canvas_h != height or canvas_w != width:
+            buf = _resize_rgb(buf, width, height)
+            sx, sy = width / canvas_w, height / canvas_h
+            x0, x1, y0, y1 = x0 * sx, x1 * sx, y0 * sy, y1 * sy
+
+        self._fig = fig
+        self._ax = ax
+        self._playhead = playhead
+        self._mpl_playhead = mpl_playhead
+        # Whole-figure region: the playhead's line caps reach a pixel past the axes bbox
+        self._mpl_bg = fig.canvas.copy_from_bbox(fig.bbox) if mpl_playhead else None
+        self._size = (height, width)
+        self._bg = buf
+        self._x0 = float(x0)
+        self._x1 = float(x1)
+        self._y0 = max(0, int(round(y0)))
+        self._y1 = min(height, int(round(y1)))
+        self._t_max = trial.test_duration
+
+    def frame(self, playhead_time: float) -> np.ndarray:
+        """Return the chart with the playhead at playhead_time as an RGB array (H, W, 3)."""
+        if self._mpl_playhead:
+            return self._frame_blit(playhead_time)
+        buf = self._bg.copy()
+        frac = playhead_time / self._t_max if self._t_max > 0 else 0.0
+        col = int(self._x0 + frac * (self._x1 - self._x0))
+        col = min(max(col, 1), buf.shape[1] - 1)
+        buf[self._y0 : self._y1, col - 1 : col + 1] = self.PLAYHEAD_RGB
+        return buf
+
+    def _frame_blit(self, playhead_time: float) -> np.ndarray:
+        """Playhead drawn by matplotlib: restore the saved background, draw only the playhead."""
+        canvas = self._fig.canvas
+        canvas.restore_region(self._mpl_bg)
+        self._playhead.set_xdata([playhead_time, playhead_time])
+        self._ax.draw_artist(self._playhead)
+        canvas.blit(self._ax.bbox)
+        buf = _canvas_rgb(canvas)
+        if buf.shape[:2] != self._size:
+            buf = _resize_rgb(buf, self._size[1], self._size[0])
+        return buf
+
+
+def _ffmpeg_exe() -> str:
+    """Return the ffmpeg binary bundled with moviepy (imageio-ffmpeg), else the one on PATH."""
+    try:
+        from imageio_ffmpeg import get_ffmpeg_exe
+        return get_ffmpeg_exe()
+    except ImportError:
+        exe = shutil.which("ffmpeg")
+        if exe is None:
+            raise SystemExit("ffmpeg is required. Install with: pip install imageio-ffmpeg") from None
+        return exe
 
-    # Resize to exact (height, width) if canvas size differed
-    if buf.shape[0] != height or buf.shape[1] != width:
-        from scipy.ndimage import zoom
-        zoom_factors = (height / buf.shape[0], width / buf.shape[1], 1)
-        buf = zoom(buf, zoom_factors, order=1).astype(np.uint8)
-    return buf
+
+# Hardware H.264 encoders in preference order (NVIDIA, Apple, Intel Quick Sync)
+_HW_H264_ENCODERS = ("h264_nvenc", "h264_videotoolbox", "h264_qsv")
+
+
+def _pick_video_codec(ffmpeg: str, hw_encode: bool) -> str:
+    """Return a hardware H.264 encoder this ffmpeg build offers when hw_encode is set, else libx264.
+
+    Being listed by ``ffmpeg -encoders`` does not guarantee the device exists, so hardware
+    encoding is opt-in (--hw-encode) rather than automatic.
+    """
+    if not hw_encode:
+        return "libx264"
+    try:
+        listing = subprocess.run(
+            [ffmpeg, "-hide_banner", "-encoders"], capture_output=True, text=True, check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        listing = ""
+    available = {line.split()[1] for line in listing.splitlines() if len(line.split()) > 1}
+    for codec in _HW_H264_ENCODERS:
+        if codec in available:
+            return codec
+    print("No hardware H.264 encoder available; falling back to libx264.")
+    return "libx264"
+
+
+def _ffmpeg_writer_cmd(
+    width: int,
+    height: int,
+    fps: float,
+    video_path: Path,
+    out_path: Path,
+    ffmpeg: str,
+    codec: str = "libx264",
+    preset: str = "veryfast",
+) -> List[str]:
+    """ffmpeg command reading raw RGB frames on stdin and taking audio (if any) from video_path.
+
+    preset applies to libx264 only; hardware encoders run with their defaults.
+    """
+    video_codec = ["-c:v", codec] + (["-preset", preset] if codec == "libx264" else [])
+    return [
+        ffmpeg,
+        "-y",
+        "-loglevel", "error",
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",
+        "-s", f"{width}x{height}",
+        "-r", f"{fps}",
+        "-i", "-",
+        "-i", str(video_path),
+        "-map", "0:v",
+        "-map", "1:a?",
+        "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+        *video_codec,
+        "-pix_fmt", "yuv420p",
+        "-c:a", "aac",
+        "-shortest",
+        str(out_path),
+    ]
 
 
 def main() -> None:
@@ -129,6 +282,29 @@ def main() -> None:
         metavar="PX",
         help="Height of the chart panel in pixels (default: 280)",
     )
+    parser.add_argument(
+        "--lines",
+        choices=("total", "all"),
+        default="total",
+        help="Force lines on the chart: total only, or total + left/right (default: total)",
+    )
+    parser.add_argument(
+        "--mpl-playhead",
+        action="store_true",
+        help="Draw the playhead with matplotlib blitting (dashed, anti-aliased; slower than the default)",
+    )
+    parser.add_argument(
+        "--preset",
+        type=str,
+        default="veryfast",
+        choices=("ultrafast", "superfast", "veryfast", "faster", "fast", "medium", "slow"),
+        help="libx264 speed/quality preset (default: veryfast; medium for smaller files)",
+    )
+    parser.add_argument(
+        "--hw-encode",
+        action="store_true",
+        help="Encode with a hardware H.264 encoder (NVENC / VideoToolbox / QSV) when ffmpeg offers one",
+    )
     args = parser.parse_args()
 
     video_path = Path(args.video)
@@ -159,8 +335,8 @@ def main() -> None:
     if use_two_point:
         if args.onset_video >= args.landing_video:
             raise SystemExit("--onset-video must be less than --landing-video")
-        bw, _ = compute_baseline(trial)
-        events = detect_events(trial, bodyweight=bw)
+        bw, _mass, sigma_quiet = compute_baseline(trial)
+        events = detect_events(trial, bodyweight=bw, sigma_quiet=sigma_quiet)
         if events.movement_onset is None or events.landing is None:
             raise SystemExit(
                 "Could not detect onset and/or landing in data. "
@@ -186,41 +362,40 @@ def main() -> None:
             return float(np.clip(t_sec - offset, 0, trial.test_duration))
 
     try:
-        from moviepy import VideoFileClip, VideoClip
+        from moviepy import VideoFileClip
     except ImportError:
         try:
-            from moviepy.editor import VideoFileClip, VideoClip
+            from moviepy.editor import VideoFileClip
         except ImportError:
             raise SystemExit("moviepy is required. Install with: pip install moviepy") from None
 
     print("Loading video...")
-    video = VideoFileClip(str(video_path))
+    # Single sequential pass: no audio reader (ffmpeg maps the audio track straight from
+    # the source file) and no frame memoization, so memory stays flat for long videos.
+    video = VideoFileClip(str(video_path), audio=False)
+    video.memoize = False
     w, h = video.size
     chart_h = args.chart_height
+    fps = video.fps
+    chart = ChartRenderer(trial, width=w, height=chart_h, mpl_playhead=args.mpl_playhead, lines=args.lines)
 
-    def make_frame(t_sec: float):
-        data_time = video_to_data_time(t_sec)
-        vid_frame = video.get_frame(t_sec)
-        chart_img = render_chart_frame(trial, data_time, width=w, height=chart_h)
-        return np.vstack([vid_frame, chart_img])
-
-    print("Rendering composite video (this may take a while)...")
-    out_clip = VideoClip(make_frame, duration=video.duration)
-    if video.audio is not None:
-        try:
-            out_clip = out_clip.with_audio(video.audio)
-        except AttributeError:
-            out_clip = out_clip.set_audio(video.audio)
-    out_clip.write_videofile(
-        str(out_path),
-        codec="libx264",
-        audio_codec="aac",
-        fps=video.fps,
-        preset="medium",
-        logger=None,
-    )
-    video.close()
-    out_clip.close()
+    ffmpeg = _ffmpeg_exe()
+    codec = _pick_video_codec(ffmpeg, args.hw_encode)
+    print(f"Rendering composite video with {codec} (this may take a while)...")
+    cmd = _ffmpeg_writer_cmd(w, h + chart_h, fps, video_path, out_path, ffmpeg, codec, args.preset)
+    writer = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+    try:
+        # Compositing is a copy of the cached chart plus a vstack (about a millisecond per
+        # frame), so frames are built here and streamed straight to ffmpeg's stdin.
+        for t_sec, vid_frame in video.iter_frames(fps=fps, with_times=True, dtype="uint8"):
+            chart_img = chart.frame(video_to_data_time(t_sec))
+            writer.stdin.write(np.vstack([vid_frame, chart_img]).tobytes())
+    finally:
+        writer.stdin.close()
+        returncode = writer.wait()
+        video.close()
+    if returncode != 0:
+        raise SystemExit(f"ffmpeg failed with exit code {returncode}")
     print(f"Saved: {out_path}")
 
 
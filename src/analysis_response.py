@@ -75,7 +75,7 @@ _PHASE_NAME_TO_SLUG: Dict[str, str] = {
     # DJ
     "Pre-jump": "pre_jump",
     "Contact": "contact",
-    # SJ (Concentric phase name reused)
+    # SJ reuses Quiet / Concentric / Flight / Landing
 }
 
 PHASE_EXPLANATIONS: Dict[str, str] = {
@@ -114,6 +114,9 @@ _KEY_POINT_NAME_TO_SLUG: Dict[str, str] = {
     "Contraction start": "contraction_start",
     "Peak force": "peak_force",
     "Peak landing force": "peak_landing_force",
+    "First peak (bimodal)": "first_peak_bimodal",
+    "Trough between peaks (bimodal)": "trough_between_peaks_bimodal",
+    "Second peak (bimodal)": "second_peak_bimodal",
 }
 
 KEY_POINT_EXPLANATIONS: Dict[str, str] = {
@@ -219,12 +222,31 @@ METRIC_EXPLANATIONS: Dict[str, str] = {
 }
 
 
+_PHASE_SLUG_TBL = str.maketrans({" ": "_"})
+_KEY_POINT_SLUG_TBL = str.maketrans({" ": "_", "(": None, ")": None})
+
+
+def _phase_slug(name: str) -> str:
+    """Fallback slug for a phase name missing from _PHASE_NAME_TO_SLUG."""
+    name = name.lower()
+    if " - " in name:
+        name = name.replace(" - ", "_")
+    return name.translate(_PHASE_SLUG_TBL)
+
+
+def _key_point_slug(name: str) -> str:
+    """Fallback slug for a key point name missing from _KEY_POINT_NAME_TO_SLUG."""
+    return name.lower().translate(_KEY_POINT_SLUG_TBL)
+
+
 def build_analysis_response(payload: Dict[str, Any]) -> Dict[str, Any]:
     """Build the structured analysis block: phases, key_points, metrics as key -> { value, explanation }.
 
     Uses the existing visualization payload (phases, key_points, metrics). Adds phase_order and
     key_point_order for deterministic display order. Unknown keys get an empty explanation.
     Selects DJ- or SJ-specific ordering when test_type is 'DJ' or 'SJ'.
+
+    Phase and key point entries are referenced, not copied, from the payload.
     """
     test_type = (payload.get("test_type") or "").strip().upper()
     is_dj = test_type == "DJ"
@@ -249,15 +271,15 @@ def build_analysis_response(payload: Dict[str, Any]) -> Dict[str, Any]:
 
     for p in payload.get("phases") or []:
         name = p.get("name") or ""
-        slug = _PHASE_NAME_TO_SLUG.get(name, name.lower().replace(" - ", "_").replace(" ", "_"))
+        slug = _PHASE_NAME_TO_SLUG.get(name) or _phase_slug(name)
         explanation = PHASE_EXPLANATIONS.get(slug, "")
-        analysis["phases"][slug] = {"value": dict(p), "explanation": explanation}
+        analysis["phases"][slug] = {"value": p, "explanation": explanation}
 
     for kp in payload.get("key_points") or []:
         name = kp.get("name") or ""
-        slug = _KEY_POINT_NAME_TO_SLUG.get(name, name.lower().replace(" ", "_").replace("(", "").replace(")", ""))
+        slug = _KEY_POINT_NAME_TO_SLUG.get(name) or _key_point_slug(name)
         explanation = KEY_POINT_EXPLANATIONS.get(slug, "")
-        analysis["key_points"][slug] = {"value": dict(kp), "explanation": explanation}
+        analysis["key_points"][slug] = {"value": kp, "explanation": explanation}
 
     for k, v in (payload.get("metrics") or {}).items():
         explanation = METRIC_EXPLANATIONS.get(k, "")
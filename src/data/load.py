@@ -1,19 +1,76 @@
 """Load raw CMJ/DJ JSON exports and build typed trial data."""
 import json
+from array import array
 from pathlib import Path
-from typing import Any, Dict, Union
+from typing import Any, Dict, Sequence, Union
 
 import numpy as np
 
 from .types import CMJTrial
 
+try:
+    import orjson
+except ImportError:  # optional: faster JSON parsing
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional: streaming parse of very large exports
+    ijson = None
+
+# Files above this size are stream-parsed (when ijson is available) to avoid holding
+# both the raw bytes and a Python list of boxed floats per force array in memory.
+STREAM_THRESHOLD_BYTES = 10_000_000
+
+_FORCE_KEYS = frozenset({"force", "total_force", "left_force", "right_force"})
+_SCALAR_EVENTS = frozenset({"string", "number", "boolean", "null"})
+
+
+def _to_array(values: Sequence[float]) -> np.ndarray:
+    """Convert a JSON number list (or existing array) to a contiguous float32 array.
+
+    np.fromiter with a known count pre-allocates the output and unboxes each
+    float directly, skipping the intermediate object array of np.asarray(list).
+    """
+    if isinstance(values, np.ndarray):
+        return np.ascontiguousarray(values, dtype=np.float32)
+    return np.fromiter(values, dtype=np.float32, count=len(values))
+
+
+def _load_streaming(path: Path) -> Dict[str, Any]:
+    """Stream-parse an export with ijson, filling force samples straight into float32 buffers.
+
+    Only top-level scalars and the force arrays are kept; samples never exist as a
+    Python list, so peak memory stays close to the size of the final arrays.
+    """
+    data: Dict[str, Any] = {}
+    append = None
+    with open(path, "rb") as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if append is not None and event == "number":
+                append(value)
+            elif append is not None and event == "null":
+                # A null sample becomes NaN, as in _to_array, so the arrays keep their length
+                append(float("nan"))
+            elif event == "start_array" and prefix in _FORCE_KEYS:
+                buf = array("f")
+                data[prefix] = buf
+                append = buf.append
+            elif event == "end_array":
+                append = None
+            elif event in _SCALAR_EVENTS and "." not in prefix:
+                data[prefix] = value
+    for key in _FORCE_KEYS.intersection(data):
+        data[key] = np.frombuffer(data[key], dtype=np.float32)
+    return data
+
 
 def _resolve_force(data: Dict[str, Any]) -> np.ndarray:
     """Return total force array, accepting 'force' or 'total_force' key."""
     if "force" in data:
-        return np.asarray(data["force"], dtype=float)
+        return _to_array(data["force"])
     if "total_force" in data:
-        return np.asarray(data["total_force"], dtype=float)
+        return _to_array(data["total_force"])
     raise ValueError("Missing required key: 'force' (or 'total_force')")
 
 
@@ -22,7 +79,8 @@ def load_trial_from_dict(data: Dict[str, Any]) -> CMJTrial:
 
     Tolerant of missing optional fields:
       - athlete_id: falls back to 'name' key, then 'unknown'.
-      - sample_count: derived from force array length if absent.
+      - sample_count: derived from the arrays; if total/left/right lengths differ,
+        all three are truncated to the shortest.
       - force key: accepts 'force' or 'total_force'.
     """
     force = _resolve_force(data)
@@ -32,24 +90,20 @@ def load_trial_from_dict(data: Dict[str, Any]) -> CMJTrial:
     if "test_duration" not in data:
         raise ValueError("Missing required key: test_duration")
 
-    left_force = np.asarray(data["left_force"], dtype=float)
-    right_force = np.asarray(data["right_force"], dtype=float)
-    sample_count = int(data.get("sample_count", len(force)))
+    left_force = _to_array(data["left_force"])
+    right_force = _to_array(data["right_force"])
     test_duration = float(data["test_duration"])
     athlete_id = str(data.get("athlete_id") or data.get("name") or "unknown")
     test_type = str(data.get("test_type", "CMJ"))
 
-    if len(force) != sample_count:
-        sample_count = len(force)
-    if len(left_force) != sample_count or len(right_force) != sample_count:
-        min_len = min(len(force), len(left_force), len(right_force))
-        force = force[:min_len]
-        left_force = left_force[:min_len]
-        right_force = right_force[:min_len]
-        sample_count = min_len
+    # Length consistency is enforced once, in CMJTrial.__post_init__; here only truncate
+    sample_count = min(len(force), len(left_force), len(right_force))
+    if not (len(force) == len(left_force) == len(right_force)):
+        force = force[:sample_count]
+        left_force = left_force[:sample_count]
+        right_force = right_force[:sample_count]
 
     sample_rate = sample_count / test_duration
-    t = np.arange(sample_count, dtype=float) / sample_rate
 
     return CMJTrial(
         athlete_id=athlete_id,
@@ -60,7 +114,6 @@ def load_trial_from_dict(data: Dict[str, Any]) -> CMJTrial:
         left_force=left_force,
         right_force=right_force,
         sample_rate=sample_rate,
-        t=t,
     )
 
 
@@ -76,7 +129,7 @@ def load_trial(path: Union[str, Path]) -> CMJTrial:
         path: Path to the JSON file.
 
     Returns:
-        CMJTrial with force arrays and time vector.
+        CMJTrial with float32 force arrays (time vector built lazily via trial.t).
 
     Raises:
         FileNotFoundError: If path does not exist.
@@ -86,7 +139,12 @@ def load_trial(path: Union[str, Path]) -> CMJTrial:
     if not path.exists():
         raise FileNotFoundError(f"File not found: {path}")
 
-    with open(path, encoding="utf-8") as f:
-        data = json.load(f)
+    if ijson is not None and path.stat().st_size > STREAM_THRESHOLD_BYTES:
+        data = _load_streaming(path)
+    elif orjson is not None:
+        data = orjson.loads(path.read_bytes())
+    else:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
 
     return load_trial_from_dict(data)
@@ -1,13 +1,46 @@
 """Typed structures for CMJ trial data."""
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Optional
 
 import numpy as np
 
 
+def widen_float32(x: np.ndarray) -> np.ndarray:
+    """float32 samples as float64 holding each value's shortest round-trip decimal.
+
+    A plain astype(float64) keeps the binary float32 value, which prints as e.g.
+    1019.5532836914062; here each value is rounded to the fewest significant digits
+    (6 to 9) that map back to the same float32, giving 1019.5533 as it was read.
+    Used wherever force values leave the package (payload arrays, force metrics).
+    """
+    a = np.asarray(x, dtype=np.float32)
+    flat = a.ravel()
+    x64 = flat.astype(np.float64)
+    mag = np.abs(x64)
+    exp10 = np.floor(np.log10(np.where((mag > 0) & np.isfinite(mag), mag, 1.0)))
+    out = x64.copy()
+    todo = np.flatnonzero(np.isfinite(x64))
+    # One vectorized round per digit count; most samples settle at 6 or 7 digits
+    for digits in (6, 7, 8, 9):
+        if not todo.size:
+            break
+        scale = 10.0 ** (digits - 1 - exp10[todo])
+        rounded = np.round(x64[todo] * scale) / scale
+        ok = rounded.astype(np.float32) == flat[todo]
+        out[todo[ok]] = rounded[ok]
+        todo = todo[~ok]
+    return out.reshape(a.shape)
+
+
 @dataclass
 class CMJTrial:
-    """Single CMJ trial from force plate export."""
+    """Single CMJ trial from force plate export.
+
+    Force arrays are stored as C-contiguous float32 (ample for plate resolution,
+    half the memory traffic of float64); other inputs are converted on
+    construction. The time vector ``t`` is built on first access.
+    """
 
     athlete_id: str
     test_type: str
@@ -17,17 +50,29 @@ class CMJTrial:
     left_force: np.ndarray
     right_force: np.ndarray
     sample_rate: float
-    t: np.ndarray
 
     def __post_init__(self) -> None:
+        # Contiguous float32 for every consumer (no-op for arrays from load_trial)
+        self.force = np.ascontiguousarray(self.force, dtype=np.float32)
+        self.left_force = np.ascontiguousarray(self.left_force, dtype=np.float32)
+        self.right_force = np.ascontiguousarray(self.right_force, dtype=np.float32)
         n = self.sample_count
-        if len(self.force) != n or len(self.left_force) != n or len(self.right_force) != n:
+        if not (self.force.shape[0] == self.left_force.shape[0] == self.right_force.shape[0] == n):
             raise ValueError(
                 f"Array length mismatch: force={len(self.force)}, "
                 f"left_force={len(self.left_force)}, right_force={len(self.right_force)}, "
                 f"sample_count={n}"
             )
 
+    @cached_property
+    def t(self) -> np.ndarray:
+        """Time vector (s) in float64, computed on first access and cached.
+
+        Kept in float64 (unlike the forces) so i / sample_rate is exact to double
+        precision: event, phase and key-point times are read from it.
+        """
+        return np.arange(self.sample_count, dtype=np.float64) / self.sample_rate
+
 
 @dataclass
 class CMJEvents:
@@ -0,0 +1,164 @@
+"""Shared array kernels for detection: baseline statistics, sustained-threshold scans, NaN-aware argmin/argmax, peak finding."""
+import math
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+
+def baseline_stats(x: np.ndarray) -> Tuple[float, float]:
+    """Mean and (population) std of x from one sum and one sum of squares.
+
+    Accumulates in float64 so var = E[x^2] - E[x]^2 stays free of cancellation error
+    for float32 force data. Returns (mean, 0.0) for fewer than two samples.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n = x.size
+    if n == 0:
+        return 0.0, 0.0
+    mean = float(x.sum() / n)
+    if n < 2:
+        return mean, 0.0
+    ss = float(np.dot(x, x))
+    return mean, math.sqrt(max(ss / n - mean * mean, 0.0))
+
+
+def _full_windows(mask: np.ndarray, n_consec: int) -> np.ndarray:
+    """Bool array w with w[i] True iff mask[i : i + n_consec] is all True (len(mask) >= n_consec).
+
+    Counts True samples per window with one cumulative sum, so the scan is a few
+    vectorized passes over the mask instead of a per-sample Python loop.
+    """
+    counts = np.cumsum(mask, dtype=np.int64)
+    window = counts[n_consec - 1 :].copy()
+    window[1:] -= counts[: len(counts) - n_consec]
+    return window == n_consec
+
+
+def _first_full_window(mask: np.ndarray, n_consec: int) -> Optional[int]:
+    """First index i such that mask[i : i + n_consec] is all True, else None."""
+    if len(mask) < n_consec:
+        return None
+    hits = np.flatnonzero(_full_windows(mask, n_consec))
+    return int(hits[0]) if hits.size else None
+
+
+def first_sustained_below(x: np.ndarray, threshold: float, n_consec: int) -> Optional[int]:
+    """First index i such that no sample of x[i : i + n_consec] is >= threshold, else None.
+
+    A NaN does not break a window, like the `force[j] >= threshold` loops this replaces.
+    """
+    n_consec = max(1, int(n_consec))
+    if len(x) < n_consec:
+        return None
+    return _first_full_window(~(np.asarray(x) >= threshold), n_consec)
+
+
+def first_sustained_in_range(
+    force: np.ndarray,
+    threshold: float,
+    start: int,
+    end: int,
+    min_samples: int,
+    above: bool,
+) -> Optional[int]:
+    """First index i in [start, end - min_samples + 1] with force[i] strictly above
+    (above=True) or below threshold and no sample of its min_samples-long window at or
+    past threshold (<= for above, >= for below), else None.
+
+    Same contract as the per-detector scan loops it replaces (end is clipped to the
+    last sample): a NaN cannot start a window but does not break one. Only the slice
+    the candidate windows cover is compared.
+    """
+    n = len(force)
+    start = max(0, start)
+    k = max(1, int(min_samples))
+    last = min(min(end, n - 1) - min_samples + 1, n - k)
+    if last < start:
+        return None
+    seg = np.asarray(force[start : last + k])
+    if above:
+        ok, cand = ~(seg <= threshold), seg[: last - start + 1] > threshold
+    else:
+        ok, cand = ~(seg >= threshold), seg[: last - start + 1] < threshold
+    hits = np.flatnonzero(_full_windows(ok, k) & cand)
+    return start + int(hits[0]) if hits.size else None
+
+
+def first_crossing_sustained_below(
+    x: np.ndarray, threshold: float, n_consec: int, start: int = 1
+) -> Optional[int]:
+    """First descending crossing i >= start (x[i - 1] >= threshold > x[i]) whose next
+    n_consec samples x[i + 1 : i + 1 + n_consec] also stay below threshold (none >= threshold;
+    a NaN there does not break the window), else None.
+
+    A crossing with fewer than n_consec samples after it ends the search (nothing
+    later can qualify either). Used for take-off detection.
+    """
+    x = np.asarray(x)
+    n = len(x)
+    start = max(1, start)
+    if start >= n:
+        return None
+    seg = x[start - 1 :]
+    cross = np.flatnonzero((seg[:-1] >= threshold) & (seg[1:] < threshold)) + start
+    if n_consec <= 0:
+        return int(cross[0]) if cross.size else None
+    cross = cross[cross + n_consec < n]
+    if not cross.size:
+        return None
+    # A window sample fails only if it is >= threshold, so a NaN dropout does not break it
+    below = ~(seg >= threshold)
+    # Below-count of the window after each crossing, gathered only at the crossings:
+    # below[r] is x[start - 1 + r], so the window x[i + 1 : i + 1 + n_consec] starts at r = i + 2 - start
+    counts = np.cumsum(below, dtype=np.int64)
+    r0 = cross + (2 - start)
+    hits = np.flatnonzero(counts[r0 + (n_consec - 1)] - counts[r0 - 1] == n_consec)
+    return int(cross[hits[0]]) if hits.size else None
+
+
+def last_within(x: np.ndarray, value: float, tol: float) -> Optional[int]:
+    """Last index i with |x[i] - value| <= tol (compared in float64), else None.
+
+    Equivalent to scanning backward from the end for the first close sample.
+    """
+    close = np.abs(np.asarray(x, dtype=np.float64) - value) <= tol
+    hits = np.flatnonzero(close)
+    return int(hits[-1]) if hits.size else None
+
+
+def nan_argmin(x: np.ndarray) -> Optional[int]:
+    """Index of the smallest non-NaN value; None if x is empty or all NaN.
+
+    np.argmin stops at the first NaN, so a NaN result falls back to np.nanargmin;
+    clean data costs a single pass (the scalar check uses math.isnan, not a ufunc).
+    """
+    if len(x) == 0:
+        return None
+    i = int(np.argmin(x))
+    if not math.isnan(x[i]):
+        return i
+    if np.isnan(x).all():
+        return None
+    return int(np.nanargmin(x))
+
+
+def nan_argmax(x: np.ndarray) -> Optional[int]:
+    """Index of the largest non-NaN value; None if x is empty or all NaN (see nan_argmin)."""
+    if len(x) == 0:
+        return None
+    i = int(np.argmax(x))
+    if not math.isnan(x[i]):
+        return i
+    if np.isnan(x).all():
+        return None
+    return int(np.nanargmax(x))
+
+
+def find_peaks(x: np.ndarray, **kwargs: Any) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """scipy.signal.find_peaks, imported on first call.
+
+    scipy.signal takes most of a second to import, so detection modules call this
+    instead of importing it at module level (the package stays cheap to import).
+    """
+    from scipy.signal import find_peaks as _find_peaks
+    return _find_peaks(x, **kwargs)
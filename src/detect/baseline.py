@@ -4,6 +4,7 @@ from typing import Union
 import numpy as np
 
 from ..data.types import CMJTrial
+from ._kernels import baseline_stats
 
 G = 9.81
 
@@ -14,7 +15,8 @@ def compute_baseline(
     """Compute bodyweight (N), mass (kg), and sigma_quiet from the first weighing_seconds.
 
     Uses mean and std of vertical force over the weighing phase; mass = BW / g.
-    sigma_quiet is used for statistical movement-onset detection.
+    sigma_quiet is used for statistical movement-onset detection. Mean and std come
+    from one sum and one sum of squares (var = E[x^2] - E[x]^2), accumulated in float64.
 
     Returns:
         (bodyweight_N, mass_kg, sigma_quiet_N).
@@ -22,10 +24,8 @@ def compute_baseline(
     n_weighing = min(int(trial.sample_rate * weighing_seconds), trial.sample_count)
     if n_weighing <= 0:
         n_weighing = min(int(trial.sample_rate * 0.1), trial.sample_count)
-    seg = trial.force[:n_weighing]
-    bodyweight = float(np.mean(seg))
+    bodyweight, sigma_quiet = baseline_stats(trial.force[:n_weighing])
     mass = bodyweight / G
-    sigma_quiet = float(np.std(seg)) if len(seg) > 1 else 0.0
     return bodyweight, mass, sigma_quiet
 
 
@@ -70,16 +70,16 @@ def compute_baseline_drop_jump(
     above = seg[seg >= min_force_threshold_n]
 
     if len(above) >= max(10, int(fs * 0.05)):
-        bodyweight = float(np.mean(above))
-        sigma = float(np.std(above)) if len(above) > 1 else 0.0
+        bodyweight = float(np.mean(above, dtype=np.float64))
+        sigma = float(np.std(above, dtype=np.float64)) if len(above) > 1 else 0.0
     else:
         all_above = force[force >= min_force_threshold_n]
         if len(all_above) > 0:
-            bodyweight = float(np.mean(all_above))
-            sigma = float(np.std(all_above)) if len(all_above) > 1 else 0.0
+            bodyweight = float(np.mean(all_above, dtype=np.float64))
+            sigma = float(np.std(all_above, dtype=np.float64)) if len(all_above) > 1 else 0.0
         else:
-            bodyweight = float(np.mean(force))
-            sigma = float(np.std(force)) if n > 1 else 0.0
+            bodyweight = float(np.mean(force, dtype=np.float64))
+            sigma = float(np.std(force, dtype=np.float64)) if n > 1 else 0.0
 
     mass = bodyweight / G
     return bodyweight, mass, sigma
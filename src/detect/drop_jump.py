@@ -11,7 +11,9 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
-from scipy.signal import find_peaks
+
+from ..signal import savgol_smooth
+from ._kernels import find_peaks, first_sustained_in_range
 
 
 # ---------------------------------------------------------------------------
@@ -130,10 +132,6 @@ def _ms_to_samples(ms: float, fs: float) -> int:
 
 def _smooth_for_peaks(force: np.ndarray, fs: float, window_ms: float = DEFAULT_PEAK_SMOOTH_WINDOW_MS) -> np.ndarray:
     """Light low-pass for peak/valley detection only. Returns a copy; use for find_peaks, not for thresholds."""
-    try:
-        from scipy.signal import savgol_filter
-    except ImportError:
-        return np.asarray(force, dtype=float)
     n = len(force)
     if n < 10:
         return np.asarray(force, dtype=float)
@@ -141,7 +139,7 @@ def _smooth_for_peaks(force: np.ndarray, fs: float, window_ms: float = DEFAULT_P
     w = min(n - 1 if n % 2 == 0 else n, max(5, w | 1))
     if w < 5:
         return np.asarray(force, dtype=float)
-    return savgol_filter(force.astype(float), window_length=w, polyorder=3, mode="nearest")
+    return savgol_smooth(force, w, 3)
 
 
 def _first_differences(force: np.ndarray) -> np.ndarray:
@@ -171,20 +169,7 @@ def first_crossing_above(
     force: np.ndarray, threshold: float, start: int, end: int, min_samples: int
 ) -> Optional[int]:
     """First index where force rises above threshold and stays above for min_samples."""
-    n = len(force)
-    i = max(0, start)
-    end = min(end, n - 1)
-    while i <= end - min_samples + 1:
-        if force[i] > threshold:
-            ok = True
-            for j in range(i, min(i + min_samples, n)):
-                if j >= n or force[j] <= threshold:
-                    ok = False
-                    break
-            if ok:
-                return i
-        i += 1
-    return None
+    return first_sustained_in_range(force, threshold, start, end, min_samples, above=True)
 
 
 def _contact_start_valid(
@@ -290,20 +275,7 @@ def first_crossing_below(
     force: np.ndarray, threshold: float, start: int, end: int, min_samples: int
 ) -> Optional[int]:
     """First index where force drops below threshold and stays below for min_samples."""
-    n = len(force)
-    i = max(0, start)
-    end = min(end, n - 1)
-    while i <= end - min_samples + 1:
-        if force[i] < threshold:
-            ok = True
-            for j in range(i, min(i + min_samples, n)):
-                if j >= n or force[j] >= threshold:
-                    ok = False
-                    break
-            if ok:
-                return i
-        i += 1
-    return None
+    return first_sustained_in_range(force, threshold, start, end, min_samples, above=False)
 
 
 def _slope_before_positive(force: np.ndarray, idx: int) -> bool:
@@ -13,7 +13,8 @@ Peak identity is by temporal position (impact window vs drive-off), not amplitud
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
-from scipy.signal import find_peaks
+
+from ._kernels import find_peaks, first_sustained_in_range
 
 
 # ---------------------------------------------------------------------------
@@ -71,20 +72,7 @@ def _first_crossing_above_sustained(
     First index in [start, end] where force rises above threshold and stays
     above for at least min_samples. Returns the index of the first sample above.
     """
-    n = len(force)
-    i = max(0, start)
-    end = min(end, n - 1)
-    while i <= end - min_samples + 1:
-        if force[i] > threshold:
-            ok = True
-            for j in range(i, min(i + min_samples, n)):
-                if j >= n or force[j] <= threshold:
-                    ok = False
-                    break
-            if ok:
-                return i
-        i += 1
-    return None
+    return first_sustained_in_range(force, threshold, start, end, min_samples, above=True)
 
 
 def _first_segment_below_sustained(
@@ -98,20 +86,7 @@ def _first_segment_below_sustained(
     First index in [start, end] where force is below threshold and stays below
     for at least min_samples. Returns that start index.
     """
-    n = len(force)
-    i = max(0, start)
-    end = min(end, n - 1)
-    while i <= end - min_samples + 1:
-        if force[i] < threshold:
-            ok = True
-            for j in range(i, min(i + min_samples, n)):
-                if j >= n or force[j] >= threshold:
-                    ok = False
-                    break
-            if ok:
-                return i
-        i += 1
-    return None
+    return first_sustained_in_range(force, threshold, start, end, min_samples, above=False)
 
 
 def _find_contact_episodes(
@@ -182,20 +157,7 @@ def _first_crossing_below_sustained(
     First index in [start, end] where force drops below threshold and stays
     below for at least min_samples. Returns the index of the first sample below.
     """
-    n = len(force)
-    i = max(0, start)
-    end = min(end, n - 1)
-    while i <= end - min_samples + 1:
-        if force[i] < threshold:
-            ok = True
-            for j in range(i, min(i + min_samples, n)):
-                if j >= n or force[j] >= threshold:
-                    ok = False
-                    break
-            if ok:
-                return i
-        i += 1
-    return None
+    return first_sustained_in_range(force, threshold, start, end, min_samples, above=False)
 
 
 def _slope_before_positive(force: np.ndarray, idx: int, margin: int = _SLOPE_MARGIN) -> bool:
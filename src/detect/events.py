@@ -1,9 +1,15 @@
 """Take-off, landing, movement onset, and min-force detection."""
-from typing import Optional
+from typing import Optional, Tuple
 
 import numpy as np
 
 from ..data.types import CMJTrial, CMJEvents
+from ._kernels import (
+    first_crossing_sustained_below,
+    last_within,
+    nan_argmax,
+    nan_argmin,
+)
 
 DEFAULT_TAKE_OFF_THRESHOLD_N = 20.0
 DEFAULT_LANDING_THRESHOLD_N = 200.0
@@ -40,89 +46,102 @@ def detect_events(
         take_off_threshold = max(DEFAULT_TAKE_OFF_THRESHOLD_N, 0.05 * bodyweight)
     if landing_threshold is None:
         landing_threshold = max(DEFAULT_LANDING_THRESHOLD_N, 0.05 * bodyweight)
+    # "Close" to takeoff: within 3% bodyweight or 30 N so takeoff and landing force match
+    close_tolerance = max(30.0, 0.03 * bodyweight)
+    onset_threshold = bodyweight - onset_n_sigma * sigma_quiet
+    if sigma_quiet <= 0 or onset_threshold <= 0:
+        onset_threshold = (1.0 - onset_below_bw) * bodyweight
 
-    force = trial.force
-    n = len(force)
+    # Cast once to contiguous float64: every threshold compare and kernel below runs on this array
+    force = np.ascontiguousarray(trial.force, dtype=np.float64)
     sr = trial.sample_rate
+    movement_onset, take_off, landing, min_force = _detect_events_core(
+        force,
+        take_off_threshold=take_off_threshold,
+        take_off_consecutive=min(take_off_consecutive_samples, len(force) - 1),
+        close_tolerance=close_tolerance,
+        onset_threshold=onset_threshold,
+        onset_start=int(0.5 * sr),
+        sustain_onset=max(1, int(np.ceil(sr * onset_sustain_ms / 1000.0))),
+    )
+    return CMJEvents(
+        movement_onset=movement_onset,
+        take_off=take_off,
+        landing=landing,
+        eccentric_end=None,
+        velocity_zero=None,
+        min_force=min_force,
+    )
+
+
+def _detect_events_core(
+    force: np.ndarray,
+    take_off_threshold: float,
+    take_off_consecutive: int,
+    close_tolerance: float,
+    onset_threshold: float,
+    onset_start: int,
+    sustain_onset: int,
+) -> Tuple[Optional[int], Optional[int], Optional[int], Optional[int]]:
+    """Event scan on a float64 force array with every option already resolved to a scalar.
+
+    Returns (movement_onset, take_off, landing, min_force); see detect_events for the rules.
+    """
+    n = len(force)
 
     # Take-off: first descending crossing with K consecutive samples below threshold
-    take_off: Optional[int] = None
-    K = min(take_off_consecutive_samples, n - 1)
-    i = 1
-    while i < n:
-        if force[i - 1] >= take_off_threshold and force[i] < take_off_threshold:
-            # Check next K samples stay below
-            end = min(i + 1 + K, n)
-            if end - (i + 1) < K:
-                i = end
-                continue
-            ok = True
-            for j in range(i + 1, i + 1 + K):
-                if force[j] >= take_off_threshold:
-                    ok = False
-                    i = j
-                    break
-            if ok:
-                take_off = i
-                break
-        i += 1
+    take_off = first_crossing_sustained_below(force, take_off_threshold, take_off_consecutive)
 
     # Landing: start from highest force after takeoff, move backward; first point close to takeoff value = landing
     landing: Optional[int] = None
     if take_off is not None and take_off + 1 < n:
-        f_to = float(force[take_off])
-        post_to = force[take_off + 1 :]
-        if len(post_to) > 0:
-            peak_offset = int(np.argmax(post_to))
+        peak_offset = nan_argmax(force[take_off + 1 :])
+        if peak_offset is not None:
             peak_idx = take_off + 1 + peak_offset
-            # "Close" to takeoff: within 3% bodyweight or 30 N so takeoff and landing force match
-            close_tolerance = max(30.0, 0.03 * bodyweight)
-            landing = None
-            for idx in range(peak_idx, take_off, -1):
-                if abs(float(force[idx]) - f_to) <= close_tolerance:
-                    landing = idx
-                    break
-            if landing is None:
-                landing = peak_idx
-
-    # Movement onset: F < BW - 5*sigma_quiet (or 0.95*BW fallback), sustained 30 ms
-    onset_threshold = bodyweight - onset_n_sigma * sigma_quiet
-    if sigma_quiet <= 0 or onset_threshold <= 0:
-        onset_threshold = (1.0 - onset_below_bw) * bodyweight
-    onset_start = int(0.5 * sr)
+            rel = last_within(force[take_off + 1 : peak_idx + 1], float(force[take_off]), close_tolerance)
+            landing = peak_idx if rel is None else take_off + 1 + rel
+
+    # Movement onset: F < onset_threshold, sustained sustain_onset samples
     onset_end = take_off if take_off is not None else n
-    sustain_onset = max(1, int(np.ceil(sr * onset_sustain_ms / 1000.0)))
     movement_onset: Optional[int] = None
-    i = onset_start
-    while i < min(onset_end, n - sustain_onset):
-        if force[i] < onset_threshold:
-            end = min(i + sustain_onset, n)
-            if end - i < sustain_onset:
-                i = end
-                continue
-            ok = True
-            for j in range(i, end):
-                if force[j] >= onset_threshold:
-                    ok = False
-                    i = j + 1
-                    break
-            if ok:
-                movement_onset = i
-                break
-        i += 1
+    # Candidates i in [onset_start, min(onset_end, n - sustain_onset)) with the next sustain_onset samples below
+    onset_limit = min(onset_end, n - sustain_onset)
+    if onset_start < onset_limit:
+        rel = _first_onset_window(
+            force[onset_start : onset_limit + sustain_onset - 1],
+            onset_threshold,
+            sustain_onset,
+            onset_limit - onset_start,
+        )
+        if rel is not None:
+            movement_onset = onset_start + rel
 
     # Min force: minimum total force strictly before takeoff [onset, take_off)
     min_force: Optional[int] = None
     if movement_onset is not None and take_off is not None and movement_onset < take_off:
-        seg = force[movement_onset : take_off]
-        if len(seg) > 0:
-            min_force = movement_onset + int(np.argmin(seg))
+        rel = nan_argmin(force[movement_onset:take_off])
+        if rel is not None:
+            min_force = movement_onset + rel
 
-    return CMJEvents(
-        movement_onset=movement_onset,
-        take_off=take_off,
-        landing=landing,
-        eccentric_end=None,
-        velocity_zero=None,
-        min_force=min_force,
-    )
+    return movement_onset, take_off, landing, min_force
+
+
+def _first_onset_window(x: np.ndarray, threshold: float, n_consec: int, limit: int) -> Optional[int]:
+    """First candidate i < limit with x[i] < threshold and no x[i : i + n_consec] >= threshold.
+
+    Keeps the onset scan's original stepping: when a window fails at j the next
+    candidate tried is j + 2 (j + 1 is never tested), and a NaN inside a window does
+    not break it. Jumps from one below-threshold candidate to the next, so the loop
+    runs once per failed window rather than once per sample.
+    """
+    cands = np.flatnonzero(x[:limit] < threshold)
+    fails = np.flatnonzero(x >= threshold)
+    k = 0
+    while k < len(cands):
+        i = int(cands[k])
+        f = int(np.searchsorted(fails, i))
+        j = int(fails[f]) if f < len(fails) else len(x)
+        if j - i >= n_consec:
+            return i
+        k = int(np.searchsorted(cands, j + 2))
+    return None
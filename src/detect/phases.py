@@ -4,6 +4,7 @@ from typing import Optional
 import numpy as np
 
 from ..data.types import CMJTrial, CMJEvents, CMJPhases
+from ._kernels import nan_argmin
 
 
 def compute_phases(
@@ -31,20 +32,22 @@ def compute_phases(
 
     start = onset
     end = take_off + 1
-    v_seg = v[start:end]
+    v_seg = np.ascontiguousarray(v[start:end], dtype=np.float64)
     if len(v_seg) == 0:
         return events
 
-    # Eccentric end: index of minimum v in [onset, take_off]
-    local_min_idx = int(np.argmin(v_seg))
+    # Eccentric end: index of minimum v in [onset, take_off] (NaN samples ignored)
+    local_min_idx = nan_argmin(v_seg)
+    if local_min_idx is None:
+        return events
     eccentric_end = start + local_min_idx
 
     # First zero crossing (v goes from negative to positive) after eccentric_end
     velocity_zero: Optional[int] = None
-    for i in range(local_min_idx, len(v_seg) - 1):
-        if v_seg[i] <= 0 and v_seg[i + 1] > 0:
-            velocity_zero = start + i + 1
-            break
+    tail = v_seg[local_min_idx:]
+    cross = np.flatnonzero((tail[:-1] <= 0) & (tail[1:] > 0))
+    if cross.size:
+        velocity_zero = start + local_min_idx + int(cross[0]) + 1
     # If v never crosses zero, use eccentric_end + 1 as fallback so we have a concentric "phase"
     if velocity_zero is None and local_min_idx < len(v_seg) - 1:
         velocity_zero = start + local_min_idx + 1
@@ -54,9 +57,9 @@ def compute_phases(
     force = trial.force
     min_force = events.min_force
     if onset is not None and velocity_zero is not None and velocity_zero > onset:
-        seg = force[onset : velocity_zero + 1]
-        if len(seg) > 0:
-            min_force = onset + int(np.argmin(seg))
+        rel = nan_argmin(force[onset : velocity_zero + 1])
+        if rel is not None:
+            min_force = onset + rel
 
     return CMJEvents(
         movement_onset=events.movement_onset,
@@ -10,10 +10,16 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
-from scipy.integrate import trapezoid
-from scipy.signal import savgol_filter, find_peaks
 
-from ..data.types import CMJTrial
+from ..data.types import CMJTrial, widen_float32
+from ..signal import savgol_smooth
+from ._kernels import (
+    find_peaks,
+    first_crossing_sustained_below,
+    first_sustained_below,
+    first_sustained_in_range,
+    last_within,
+)
 
 # ---------------------------------------------------------------------------
 # Configurable constants (spec-aligned)
@@ -138,7 +144,7 @@ def _smooth_force(force: np.ndarray, sr: float, window_ms: float, poly: int) ->
     w = min(n - 1 if (n % 2 == 0) else n, max(5, w | 1))
     if poly >= w:
         poly = max(1, w - 1)
-    return savgol_filter(force.astype(float), window_length=w, polyorder=poly, mode="nearest")
+    return savgol_smooth(force, w, poly)
 
 
 def _compute_baseline_sj(
@@ -151,8 +157,8 @@ def _compute_baseline_sj(
     if n_quiet <= 0:
         n_quiet = min(int(sr * 0.5), len(force))
     seg = force[:n_quiet]
-    bw = float(np.mean(seg))
-    sigma = float(np.std(seg)) if len(seg) > 1 else 0.0
+    bw = float(np.mean(seg, dtype=np.float64))
+    sigma = float(np.std(seg, dtype=np.float64)) if len(seg) > 1 else 0.0
     return bw, sigma
 
 
@@ -164,20 +170,7 @@ def _first_above_sustained(
     min_samples: int,
 ) -> Optional[int]:
     """First index where force > threshold and stays above for min_samples."""
-    n = len(force)
-    i = max(0, start)
-    end = min(end, n - 1)
-    while i <= end - min_samples + 1:
-        if force[i] > threshold:
-            ok = True
-            for j in range(i, min(i + min_samples, n)):
-                if force[j] <= threshold:
-                    ok = False
-                    break
-            if ok:
-                return i
-        i += 1
-    return None
+    return first_sustained_in_range(force, threshold, start, end, min_samples, above=True)
 
 
 def _first_below_sustained(
@@ -188,20 +181,7 @@ def _first_below_sustained(
     min_samples: int,
 ) -> Optional[int]:
     """First index where force < threshold and stays below for min_samples."""
-    n = len(force)
-    i = max(0, start)
-    end = min(end, n - 1)
-    while i <= end - min_samples + 1:
-        if force[i] < threshold:
-            ok = True
-            for j in range(i, min(i + min_samples, n)):
-                if force[j] >= threshold:
-                    ok = False
-                    break
-            if ok:
-                return i
-        i += 1
-    return None
+    return first_sustained_in_range(force, threshold, start, end, min_samples, above=False)
 
 
 def _first_above_after(
@@ -239,24 +219,7 @@ def _takeoff_landing_cmj_style(
         landing_close_tolerance = max(30.0, 0.03 * bodyweight)
 
     K = min(takeoff_consecutive, n - 1)
-    take_off: Optional[int] = None
-    i = max(1, search_start + 1)
-    while i < n:
-        if force[i - 1] >= takeoff_threshold and force[i] < takeoff_threshold:
-            end = min(i + 1 + K, n)
-            if end - (i + 1) < K:
-                i = end
-                continue
-            ok = True
-            for j in range(i + 1, i + 1 + K):
-                if force[j] >= takeoff_threshold:
-                    ok = False
-                    i = j
-                    break
-            if ok:
-                take_off = i
-                break
-        i += 1
+    take_off = first_crossing_sustained_below(force, takeoff_threshold, K, start=search_start + 1)
 
     landing: Optional[int] = None
     if take_off is not None and take_off + 1 < n:
@@ -265,12 +228,8 @@ def _takeoff_landing_cmj_style(
         if len(post_to) > 0:
             peak_offset = int(np.argmax(post_to))
             peak_idx = take_off + 1 + peak_offset
-            for idx in range(peak_idx, take_off, -1):
-                if abs(float(force[idx]) - f_to) <= landing_close_tolerance:
-                    landing = idx
-                    break
-            if landing is None:
-                landing = peak_idx
+            rel = last_within(force[take_off + 1 : peak_idx + 1], f_to, landing_close_tolerance)
+            landing = peak_idx if rel is None else take_off + 1 + rel
 
     return take_off, landing
 
@@ -295,15 +254,7 @@ def _detect_countermovement(
     n = contraction_start - start
     if n < sustain_samples:
         return False
-    for i in range(start, contraction_start - sustain_samples + 1):
-        ok = True
-        for j in range(i, i + sustain_samples):
-            if force[j] >= threshold:
-                ok = False
-                break
-        if ok:
-            return True
-    return False
+    return first_sustained_below(force[start:contraction_start], threshold, sustain_samples) is not None
 
 
 def _detect_bimodal(
@@ -528,10 +479,12 @@ def compute_sj_metrics(
     config: Optional[SquatJumpConfig] = None,
 ) -> Dict[str, Any]:
     """Compute SJ metrics: contraction time, flight time, jump height, peak force, RFD, impulse, etc."""
+    from scipy.integrate import trapezoid
     cfg = config or DEFAULT_SJ_CONFIG
-    force = trial.force
-    left_f = trial.left_force
-    right_f = trial.right_force
+    # Metrics are reported values: compute them in float64 from the samples as read
+    force = widen_float32(trial.force)
+    left_f = widen_float32(trial.left_force)
+    right_f = widen_float32(trial.right_force)
     n = len(force)
     sr = trial.sample_rate
     dt = 1.0 / sr
@@ -608,9 +561,8 @@ def compute_sj_metrics(
     if search_end is not None and cs < search_end:
         rfd_seg = rfd[cs : search_end + 1]
         if len(rfd_seg) > 0:
-            max_rfd_val = float(np.max(rfd_seg))
             max_rfd_rel = int(np.argmax(rfd_seg))
-            out["max_rfd_N_s"] = max_rfd_val
+            out["max_rfd_N_s"] = float(rfd_seg[max_rfd_rel])
             out["time_to_max_rfd_s"] = float(max_rfd_rel * dt)
 
     f_conc = force[cs : to_idx + 1]
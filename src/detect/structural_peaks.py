@@ -4,11 +4,9 @@ Robust structural peak detection for CMJ force-time data.
 Detects Peak 1 (P1) and Peak 2 (P2) by rise-fall cycle structure in the concentric
 phase. No smoothing or filtering of raw force. Peaks are ordered by time (P1 first, P2 second).
 """
-from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, NamedTuple
 
 import numpy as np
-from scipy.ndimage import uniform_filter1d
 
 
 # Default thresholds (configurable)
@@ -21,175 +19,145 @@ DEFAULT_MIN_P2_BEFORE_TAKEOFF_MS = 20.0
 DEFAULT_MIN_VALLEY_DROP_PCT_BW = 3.0
 
 
-@dataclass
-class MonotonicSegment:
-    """Consecutive samples with same slope sign."""
-    start_index: int
-    end_index: int
-    is_rising: bool
-    duration_samples: int
-    duration_ms: float
-    amplitude: float
-    impulse_Ns: float
-
-
-@dataclass
-class RiseFallCycle:
-    """One structural peak: rise segment followed by fall segment."""
-    peak_index_rel: int  # index in F_con
-    peak_force: float
-    valley_before: float
-    valley_after: float
-    cycle_amplitude: float
-    cycle_duration_ms: float
-    cycle_impulse_Ns: float
-    valley_depth: float
-    rise_start: int
-    fall_end: int
-
-
-def _first_differences(F: np.ndarray) -> np.ndarray:
-    """dF[i] = F[i] - F[i-1]. Length = len(F)-1. dF[0] = F[1]-F[0]."""
-    return np.diff(F.astype(float))
-
-
-def _slope_sign(dF: np.ndarray) -> np.ndarray:
-    """+1 if dF > 0, -1 if dF < 0, 0 if dF == 0."""
-    s = np.zeros(len(dF), dtype=np.int8)
-    s[dF > 0] = 1
-    s[dF < 0] = -1
-    return s
-
-
-def _monotonic_segments(
-    F_con: np.ndarray,
-    slope_sign: np.ndarray,
-    bodyweight: float,
-    dt: float,
-) -> List[MonotonicSegment]:
-    """Group consecutive samples with same slope sign. Return list of segments."""
+class MonotonicSegments(NamedTuple):
+    """Runs of consecutive samples with the same slope sign, as parallel arrays (one entry per run)."""
+    start_index: np.ndarray  # int64, first F_con index of the run
+    end_index: np.ndarray  # int64, last F_con index (inclusive; shared with the next run's start)
+    is_rising: np.ndarray  # bool
+    duration_samples: np.ndarray  # int64
+    duration_ms: np.ndarray  # float64
+    amplitude: np.ndarray  # float64
+    impulse_Ns: np.ndarray  # float64
+
+
+class RiseFallCycles(NamedTuple):
+    """Structural peaks (rise segment followed by fall segment), as parallel arrays (one entry per cycle)."""
+    peak_index_rel: np.ndarray  # int64, index in F_con
+    peak_force: np.ndarray
+    valley_before: np.ndarray
+    valley_after: np.ndarray
+    cycle_amplitude: np.ndarray
+    cycle_duration_ms: np.ndarray
+    cycle_impulse_Ns: np.ndarray
+    valley_depth: np.ndarray
+    rise_start: np.ndarray  # int64
+    fall_end: np.ndarray  # int64
+
+    @property
+    def size(self) -> int:
+        return len(self.peak_index_rel)
+
+    def take(self, idx: Any) -> "RiseFallCycles":
+        """Subset of cycles by index array, boolean mask, or slice."""
+        return RiseFallCycles(*(a[idx] for a in self))
+
+
+def _monotonic_segments(F_con: np.ndarray, cum_impulse: np.ndarray, dt: float) -> MonotonicSegments:
+    """Split F_con into runs of consecutive samples with the same slope sign.
+
+    The slope sign (+1 / -1 / 0 for rising / falling / flat steps) is taken straight
+    from the first differences and run-length encoded in the same call. Slope indices
+    i..j-1 of a run cover F_con[i] ... F_con[j], so consecutive runs share their boundary
+    sample. Every run is monotonic, so its amplitude is |F[end] - F[start]|.
+
+    cum_impulse is the running sum of (F_con - BW) * dt with a leading 0, so the impulse
+    of samples a..b (inclusive) is cum_impulse[b + 1] - cum_impulse[a].
+    """
+    dF = np.diff(F_con)
+    slope_sign = (dF > 0).astype(np.int8) - (dF < 0)
     n = len(slope_sign)
     if n == 0:
-        return []
-
-    segments: List[MonotonicSegment] = []
-    i = 0
-    while i < n:
-        s = slope_sign[i]
-        j = i
-        while j < n and slope_sign[j] == s:
-            j += 1
-        # Segment in slope index space: [i, j-1]. In F_con: start_index = i, end_index = j (inclusive would be j, but F_con has indices 0..len(F_con)-1)
-        # dF[k] is between F_con[k] and F_con[k+1]. So slope indices i..j-1 cover F_con indices i through j (j-i+1 points).
-        start_idx = i
-        end_idx = j  # last F_con index in this segment is j (so we have F_con[i] ... F_con[j])
-        if end_idx >= len(F_con):
-            end_idx = len(F_con) - 1
-        duration_samples = end_idx - start_idx + 1
-        duration_ms = duration_samples * dt * 1000.0
-        seg_force = F_con[start_idx : end_idx + 1]
-        amplitude = float(np.max(seg_force) - np.min(seg_force))
-        impulse_Ns = float(np.sum((seg_force - bodyweight) * dt))
-        segments.append(
-            MonotonicSegment(
-                start_index=start_idx,
-                end_index=end_idx,
-                is_rising=(s == 1),
-                duration_samples=duration_samples,
-                duration_ms=duration_ms,
-                amplitude=amplitude,
-                impulse_Ns=impulse_Ns,
-            )
-        )
-        i = j
-
-    return segments
+        no_idx, no_val = np.zeros(0, dtype=np.int64), np.zeros(0)
+        return MonotonicSegments(no_idx, no_idx, np.zeros(0, dtype=bool), no_idx, no_val, no_val, no_val)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(slope_sign)) + 1))
+    ends = np.append(starts[1:], n)
+    duration_samples = ends - starts + 1
+    return MonotonicSegments(
+        start_index=starts,
+        end_index=ends,
+        is_rising=slope_sign[starts] == 1,
+        duration_samples=duration_samples,
+        duration_ms=duration_samples * dt * 1000.0,
+        amplitude=np.abs(F_con[ends] - F_con[starts]),
+        impulse_Ns=cum_impulse[ends + 1] - cum_impulse[starts],
+    )
 
 
 def _build_rise_fall_cycles(
     F_con: np.ndarray,
-    segments: List[MonotonicSegment],
-    bodyweight: float,
+    segments: MonotonicSegments,
+    cum_impulse: np.ndarray,
     dt: float,
-) -> List[RiseFallCycle]:
-    """Build cycles: each is a rising segment followed by a falling segment."""
-    cycles: List[RiseFallCycle] = []
-    i = 0
-    while i < len(segments) - 1:
-        rise = segments[i]
-        fall = segments[i + 1]
-        if not rise.is_rising or fall.is_rising:
-            i += 1
-            continue
-        # Peak at transition: end of rise = start of fall
-        peak_idx = rise.end_index
-        if peak_idx >= len(F_con):
-            i += 1
-            continue
-        peak_force = float(F_con[peak_idx])
-        valley_before = float(F_con[rise.start_index])
-        valley_after = float(F_con[fall.end_index])
-        cycle_amplitude = peak_force - min(valley_before, valley_after)
-        cycle_duration_ms = (fall.end_index - rise.start_index + 1) * dt * 1000.0
-        seg_force = F_con[rise.start_index : fall.end_index + 1]
-        cycle_impulse_Ns = float(np.sum((seg_force - bodyweight) * dt))
-        valley_depth = peak_force - valley_after
-
-        cycles.append(
-            RiseFallCycle(
-                peak_index_rel=peak_idx,
-                peak_force=peak_force,
-                valley_before=valley_before,
-                valley_after=valley_after,
-                cycle_amplitude=cycle_amplitude,
-                cycle_duration_ms=cycle_duration_ms,
-                cycle_impulse_Ns=cycle_impulse_Ns,
-                valley_depth=valley_depth,
-                rise_start=rise.start_index,
-                fall_end=fall.end_index,
-            )
-        )
-        i += 1
-
-    return cycles
+    min_duration_ms: float = 0.0,
+) -> RiseFallCycles:
+    """Build cycles: each is a rising segment followed by a falling segment.
+
+    A cycle spans rise.start..fall.end; its impulse is read from cum_impulse like a segment's.
+    Cycles shorter than min_duration_ms are dropped before any other field is gathered.
+    Cycles come out in chronological order (by peak_index_rel).
+    """
+    is_rising = segments.is_rising
+    pairs = np.flatnonzero(is_rising[:-1] & ~is_rising[1:])
+    rise_start = segments.start_index[pairs]
+    fall_end = segments.end_index[pairs + 1]
+    cycle_duration_ms = (fall_end - rise_start + 1) * dt * 1000.0
+    long_enough = ~(cycle_duration_ms < min_duration_ms)
+    if not long_enough.all():
+        pairs = pairs[long_enough]
+        rise_start = rise_start[long_enough]
+        fall_end = fall_end[long_enough]
+        cycle_duration_ms = cycle_duration_ms[long_enough]
+    peak_idx = segments.end_index[pairs]
+    peak_force = F_con[peak_idx]
+    valley_before = F_con[rise_start]
+    valley_after = F_con[fall_end]
+    return RiseFallCycles(
+        peak_index_rel=peak_idx,
+        peak_force=peak_force,
+        valley_before=valley_before,
+        valley_after=valley_after,
+        cycle_amplitude=peak_force - np.minimum(valley_before, valley_after),
+        cycle_duration_ms=cycle_duration_ms,
+        cycle_impulse_Ns=cum_impulse[fall_end + 1] - cum_impulse[rise_start],
+        valley_depth=peak_force - valley_after,
+        rise_start=rise_start,
+        fall_end=fall_end,
+    )
 
 
 def _filter_noise_cycles(
-    cycles: List[RiseFallCycle],
+    cycles: RiseFallCycles,
     bodyweight: float,
     min_duration_ms: float,
     min_amplitude_pct_bw: float,
     min_impulse_Ns: float,
     min_valley_depth_pct_bw: float,
-) -> List[RiseFallCycle]:
+) -> RiseFallCycles:
     """Reject cycles that fail any threshold."""
     min_amp = (min_amplitude_pct_bw / 100.0) * bodyweight
     min_valley = (min_valley_depth_pct_bw / 100.0) * bodyweight
-    valid = []
-    for c in cycles:
-        if c.cycle_duration_ms < min_duration_ms:
-            continue
-        if c.cycle_amplitude < min_amp:
-            continue
-        if c.cycle_impulse_Ns < min_impulse_Ns:
-            continue
-        if c.valley_depth < min_valley:
-            continue
-        valid.append(c)
-    return valid
-
-
-def _confidence_score(cycles: List[RiseFallCycle], bodyweight: float) -> float:
+    keep = (
+        ~(cycles.cycle_duration_ms < min_duration_ms)
+        & ~(cycles.cycle_amplitude < min_amp)
+        & ~(cycles.cycle_impulse_Ns < min_impulse_Ns)
+        & ~(cycles.valley_depth < min_valley)
+    )
+    return cycles.take(keep)
+
+
+def _confidence_score(cycles: RiseFallCycles, bodyweight: float) -> float:
     """Score 0-1 from valley depth, impulse ratio, duration robustness."""
-    if not cycles:
+    if not cycles.size:
         return 0.0
-    scores = []
-    for c in cycles:
-        vd_norm = min(1.0, c.valley_depth / (0.1 * bodyweight)) if bodyweight > 0 else 0.0
-        imp_norm = min(1.0, c.cycle_impulse_Ns / 50.0) if c.cycle_impulse_Ns > 0 else 0.0
-        dur_norm = min(1.0, c.cycle_duration_ms / 100.0)
-        scores.append(0.4 * vd_norm + 0.3 * imp_norm + 0.3 * dur_norm)
-    return float(np.mean(scores)) if scores else 0.0
+    # fmin (not minimum) so a NaN ratio scores 1.0, as min(1.0, nan) did
+    if bodyweight > 0:
+        vd_norm = np.fmin(1.0, cycles.valley_depth / (0.1 * bodyweight))
+    else:
+        vd_norm = np.zeros(cycles.size)
+    impulse = cycles.cycle_impulse_Ns
+    imp_norm = np.where(impulse > 0, np.fmin(1.0, impulse / 50.0), 0.0)
+    dur_norm = np.fmin(1.0, cycles.cycle_duration_ms / 100.0)
+    return float(np.mean(0.4 * vd_norm + 0.3 * imp_norm + 0.3 * dur_norm))
 
 
 def detect_structural_peaks(
@@ -222,7 +190,8 @@ def detect_structural_peaks(
             "confidence_score": 0.0,
         }
 
-    F_con = force[start:end].astype(float)
+    # One contiguous float64 window (a view if force already is one); helpers below never re-cast
+    F_con = np.ascontiguousarray(force[start:end], dtype=np.float64)
     n_con = len(F_con)
     if n_con < 2:
         peak_idx = start + int(np.argmax(F_con)) if n_con == 1 else None
@@ -234,10 +203,10 @@ def detect_structural_peaks(
         }
 
     dt = 1.0 / sample_rate
-    dF = _first_differences(F_con)
-    slope = _slope_sign(dF)
-    segments = _monotonic_segments(F_con, slope, bodyweight, dt)
-    cycles = _build_rise_fall_cycles(F_con, segments, bodyweight, dt)
+    # Running (F - BW) * dt impulse: any segment or cycle impulse is a difference of two entries
+    cum_impulse = np.concatenate(([0.0], np.cumsum((F_con - bodyweight) * dt)))
+    segments = _monotonic_segments(F_con, cum_impulse, dt)
+    cycles = _build_rise_fall_cycles(F_con, segments, cum_impulse, dt, min_cycle_duration_ms)
     valid_cycles = _filter_noise_cycles(
         cycles,
         bodyweight,
@@ -247,10 +216,8 @@ def detect_structural_peaks(
         min_valley_depth_pct_bw,
     )
 
-    # Sort by time (peak_index_rel) — P1 = first cycle, P2 = second
-    valid_cycles = sorted(valid_cycles, key=lambda c: c.peak_index_rel)
-
-    if len(valid_cycles) == 0:
+    # Cycles are already chronological (built in segment order) — P1 = first cycle, P2 = second
+    if valid_cycles.size == 0:
         return {
             "P1_index": None,
             "P2_index": None,
@@ -258,8 +225,8 @@ def detect_structural_peaks(
             "confidence_score": 0.0,
         }
 
-    if len(valid_cycles) == 1:
-        p1_global = start + valid_cycles[0].peak_index_rel
+    if valid_cycles.size == 1:
+        p1_global = start + valid_cycles.peak_index_rel[0]
         return {
             "P1_index": int(p1_global),
             "P2_index": None,
@@ -268,15 +235,15 @@ def detect_structural_peaks(
         }
 
     # Two or more: P1 = first, P2 = second (chronological)
-    c1, c2 = valid_cycles[0], valid_cycles[1]
-    p1_global = start + c1.peak_index_rel
-    p2_global = start + c2.peak_index_rel
+    c1_peak, c2_peak = (int(i) for i in valid_cycles.peak_index_rel[:2])
+    p1_global = start + c1_peak
+    p2_global = start + c2_peak
 
     # Safeguards
-    separation_ms = (c2.peak_index_rel - c1.peak_index_rel) * dt * 1000.0
-    p2_before_to_ms = (end - 1 - c2.peak_index_rel) * dt * 1000.0  # distance from P2 to end of window (takeoff)
-    valley_between = float(np.min(F_con[c1.peak_index_rel : c2.peak_index_rel + 1]))
-    valley_drop = c1.peak_force - valley_between
+    separation_ms = (c2_peak - c1_peak) * dt * 1000.0
+    p2_before_to_ms = (end - 1 - c2_peak) * dt * 1000.0  # distance from P2 to end of window (takeoff)
+    valley_between = float(np.min(F_con[c1_peak : c2_peak + 1]))
+    valley_drop = float(valid_cycles.peak_force[0]) - valley_between
     min_valley_drop = (min_valley_drop_pct_bw / 100.0) * bodyweight
 
     if (
@@ -287,18 +254,35 @@ def detect_structural_peaks(
         return {
             "P1_index": int(p1_global),
             "P2_index": None,
-            "num_detected_cycles": len(valid_cycles),
-            "confidence_score": _confidence_score(valid_cycles[:1], bodyweight),
+            "num_detected_cycles": valid_cycles.size,
+            "confidence_score": _confidence_score(valid_cycles.take(slice(0, 1)), bodyweight),
         }
 
     return {
         "P1_index": int(p1_global),
         "P2_index": int(p2_global),
-        "num_detected_cycles": len(valid_cycles),
+        "num_detected_cycles": valid_cycles.size,
         "confidence_score": _confidence_score(valid_cycles, bodyweight),
     }
 
 
+# Samples per vectorized chunk in the P1->P2 line-cut check
+_LINE_CHECK_BLOCK = 256
+
+
+def _local_maxima_by_height(seg: np.ndarray) -> np.ndarray:
+    """Indices where seg >= both neighbors (boundaries compare one side), highest first.
+
+    Plateaus and shoulders count (every sample of a flat top qualifies), unlike
+    scipy.signal.find_peaks. Ties keep index order (stable sort), as list.sort did.
+    """
+    is_max = np.ones(len(seg), dtype=bool)
+    is_max[1:] &= seg[1:] >= seg[:-1]
+    is_max[:-1] &= seg[:-1] >= seg[1:]
+    idx = np.flatnonzero(is_max)
+    return idx[np.argsort(-seg[idx], kind="stable")]
+
+
 def detect_peaks_line_no_cut(
     force: np.ndarray,
     min_force_index: int,
@@ -320,7 +304,7 @@ def detect_peaks_line_no_cut(
     if start >= end or end >= len(force):
         return {"P1_index": None, "P2_index": None}
 
-    seg = force[start:end + 1].astype(float)
+    seg = np.ascontiguousarray(force[start:end + 1], dtype=np.float64)
     n = len(seg)
     if n == 0:
         return {"P1_index": None, "P2_index": None}
@@ -334,18 +318,10 @@ def detect_peaks_line_no_cut(
     p1_global = start + p1_rel
 
     # Local maxima: peak where force >= both neighbors (or boundary)
-    local_max = []
-    for i in range(n):
-        left_ok = i == 0 or seg[i] >= seg[i - 1]
-        right_ok = i == n - 1 or seg[i] >= seg[i + 1]
-        if left_ok and right_ok:
-            local_max.append(i)
-
-    if not local_max:
-        return {"P1_index": int(p1_global), "P2_index": None}
+    local_max = _local_maxima_by_height(seg)
 
-    # Sort by force descending; P1 is the highest
-    local_max.sort(key=lambda i: seg[i], reverse=True)
+    if not local_max.size:
+        return {"P1_index": int(p1_global), "P2_index": None}
 
     def line_above_curve(a_rel: int, b_rel: int) -> bool:
         """True if line from (a, seg[a]) to (b, seg[b]) never goes below seg between a and b."""
@@ -353,25 +329,25 @@ def detect_peaks_line_no_cut(
             return True
         i_lo = min(a_rel, b_rel)
         i_hi = max(a_rel, b_rel)
+        if i_hi - i_lo < 2:
+            return True
         fa = seg[a_rel]
-        fb = seg[b_rel]
-        for j in range(i_lo + 1, i_hi):
-            # Linear interpolation: value at j on the line
-            t = (j - a_rel) / (b_rel - a_rel) if (b_rel - a_rel) != 0 else 0.0
-            line_val = fa + t * (fb - fa)
-            if line_val < seg[j] - tolerance:
+        span = b_rel - a_rel
+        rise = seg[b_rel] - fa
+        # Linear interpolation on each block of samples strictly between a and b; a cut
+        # returns before the rest of the line is built (long spans, many rejected candidates)
+        for lo in range(i_lo + 1, i_hi, _LINE_CHECK_BLOCK):
+            hi = min(lo + _LINE_CHECK_BLOCK, i_hi)
+            line = fa + ((np.arange(lo, hi) - a_rel) / span) * rise
+            if np.any(line < seg[lo:hi] - tolerance):
                 return False
         return True
 
     # P2 = first candidate (by descending force) that is not P1, is at least min_sep_samples from P1, and line P1->cand doesn't cut
     p2_global = None
-    for c_rel in local_max:
-        if c_rel == p1_rel:
-            continue
-        if abs(c_rel - p1_rel) < min_sep_samples:
-            continue
-        if line_above_curve(p1_rel, c_rel):
-            p2_global = start + c_rel
+    for c_rel in local_max[np.abs(local_max - p1_rel) >= min_sep_samples]:
+        if line_above_curve(p1_rel, int(c_rel)):
+            p2_global = start + int(c_rel)
             break
 
     return {
@@ -381,11 +357,18 @@ def detect_peaks_line_no_cut(
 
 
 def _smooth_segment(seg: np.ndarray, window_samples: int) -> np.ndarray:
-    """Light moving average for detection only. window_samples must be odd."""
+    """Light moving average for detection only. window_samples must be odd.
+
+    Edges repeat the end samples (like uniform_filter1d mode="nearest"); the window
+    sums are differences of one cumulative sum over the padded segment.
+    """
     if window_samples < 3 or len(seg) < window_samples:
         return seg.copy()
     w = int(window_samples) | 1
-    return uniform_filter1d(seg.astype(float), size=w, mode="nearest")
+    half = w // 2
+    padded = np.concatenate((np.full(half, seg[0]), seg, np.full(half, seg[-1])), dtype=np.float64)
+    c = np.concatenate(([0.0], np.cumsum(padded)))
+    return (c[w:] - c[:-w]) * (1.0 / w)
 
 
 # Reference P1–P2 separation from a typical good trial (e.g. saved1: ~194 ms). Min separation
@@ -426,7 +409,7 @@ def detect_peaks_smoothed_then_match(
     if start >= end or end >= len(force):
         return {"P1_index": None, "P2_index": None}
 
-    seg_orig = force[start : end + 1].astype(float)
+    seg_orig = np.ascontiguousarray(force[start : end + 1], dtype=np.float64)
     n = len(seg_orig)
     if n == 0:
         return {"P1_index": None, "P2_index": None}
@@ -440,15 +423,10 @@ def detect_peaks_smoothed_then_match(
     # 1. Smooth for detection only
     seg_smooth = _smooth_segment(seg_orig, smooth_win)
 
-    # 2. Local maxima on smoothed segment
-    local_max = []
-    for i in range(n):
-        left_ok = i == 0 or seg_smooth[i] >= seg_smooth[i - 1]
-        right_ok = i == n - 1 or seg_smooth[i] >= seg_smooth[i + 1]
-        if left_ok and right_ok:
-            local_max.append(i)
+    # 2. Local maxima on smoothed segment, highest first
+    local_max = _local_maxima_by_height(seg_smooth)
 
-    if not local_max:
+    if not local_max.size:
         p1_rel = int(np.argmax(seg_smooth))
         p1_refined = _refine_peak_on_original(seg_orig, p1_rel, refine_win)
         return {
@@ -456,18 +434,15 @@ def detect_peaks_smoothed_then_match(
             "P2_index": None,
         }
 
-    # Sort by smoothed value descending: P1 = first, P2 = first that passes window + optional force threshold
-    local_max.sort(key=lambda i: seg_smooth[i], reverse=True)
-    p1_rel_smooth = local_max[0]
+    # P1 = highest, P2 = first (by smoothed value) that passes window + optional force threshold
+    p1_rel_smooth = int(local_max[0])
     p1_force = float(seg_orig[p1_rel_smooth])
-    p2_rel_smooth = None
-    for c in local_max[1:]:
-        if abs(c - p1_rel_smooth) < min_sep_samples:
-            continue
-        if min_peak2_force_ratio > 0 and seg_orig[c] < min_peak2_force_ratio * p1_force:
-            continue
-        p2_rel_smooth = c
-        break
+    rest = local_max[1:]
+    ok = np.abs(rest - p1_rel_smooth) >= min_sep_samples
+    if min_peak2_force_ratio > 0:
+        ok &= seg_orig[rest] >= min_peak2_force_ratio * p1_force
+    hits = np.flatnonzero(ok)
+    p2_rel_smooth = int(rest[hits[0]]) if hits.size else None
 
     # 3. Refine on original force (match to true chart)
     p1_refined = _refine_peak_on_original(seg_orig, p1_rel_smooth, refine_win)
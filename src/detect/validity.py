@@ -1,6 +1,8 @@
 """Trial validity checks: single take-off, plausible flight duration."""
 from typing import Optional
 
+import numpy as np
+
 from ..data.types import CMJTrial, CMJEvents, TrialValidity
 
 FLIGHT_TIME_MIN_S = 0.1
@@ -20,15 +22,11 @@ def validate_trial(
     if take_off_threshold is None:
         take_off_threshold = max(20.0, 0.05 * bodyweight)
 
-    force = trial.force
-    n = len(force)
+    force = np.asarray(trial.force)
     sr = trial.sample_rate
 
     # Count descending crossings of take-off threshold
-    crossings = 0
-    for i in range(1, n):
-        if force[i - 1] >= take_off_threshold and force[i] < take_off_threshold:
-            crossings += 1
+    crossings = int(np.count_nonzero((force[:-1] >= take_off_threshold) & (force[1:] < take_off_threshold)))
     if crossings > 1:
         flags.append("multiple_takeoff")
     if crossings == 0 and events.take_off is not None:
@@ -1,4 +1,5 @@
 """Export CMJ/DJ analysis to a single JSON for the JavaScript chart viewer."""
+import base64
 import json
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -6,13 +7,91 @@ from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 
 from .analysis_response import build_analysis_response
-from .data.types import CMJTrial, CMJEvents, TrialValidity
+from .data.types import CMJTrial, CMJEvents, TrialValidity, widen_float32
 from .detect.drop_jump import DropJumpPoints, DropJumpPhases
 from .detect.squat_jump import SquatJumpPoints, run_squat_jump_analysis
 
+try:
+    import orjson
+except ImportError:  # optional: faster JSON writing
+    orjson = None
 
-def _to_list(arr: np.ndarray) -> List[float]:
-    return arr.tolist()
+
+# Exact scalar types for the metrics dispatch: a set lookup on type(v) instead of an
+# isinstance chain through the numpy ABCs for every metric
+_PLAIN_TYPES = frozenset({type(None), bool, int, float, str})
+_NUMPY_FLOAT_TYPES = frozenset({np.float16, np.float32, np.float64, np.longdouble})
+_NUMPY_INT_TYPES = frozenset({
+    np.int8, np.int16, np.int32, np.int64,
+    np.uint8, np.uint16, np.uint32, np.uint64,
+})
+
+
+def _serialize_metrics(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of metrics with numpy floats/ints converted to Python scalars for JSON."""
+    out: Dict[str, Any] = {}
+    for k, v in metrics.items():
+        tv = type(v)
+        if tv in _PLAIN_TYPES:
+            out[k] = v
+        elif tv in _NUMPY_FLOAT_TYPES:
+            out[k] = float(v)
+        elif tv in _NUMPY_INT_TYPES:
+            out[k] = int(v)
+        elif isinstance(v, np.floating):  # other subclasses (rare)
+            out[k] = float(v)
+        elif isinstance(v, np.integer):
+            out[k] = int(v)
+        else:
+            out[k] = v
+    return out
+
+
+# (name, description, start_index, end_index, end_time_index): the end time is read at
+# end_time_index, which is the next phase's first sample for phases reported as ending one before it
+_PhaseDef = Tuple[str, str, int, int, int]
+
+
+def _phase_rows(t: np.ndarray, defs: List[_PhaseDef]) -> List[Dict[str, Any]]:
+    """Phase rows {name, description, start/end index, start/end time, duration} for defs.
+
+    Start and end times for all phases come from one fancy-index gather each, as
+    Python floats via tolist(), so the rows need no per-value float() conversion.
+    """
+    if not defs:
+        return []
+    start_times = t[[d[2] for d in defs]].tolist()
+    end_times = t[[d[4] for d in defs]].tolist()
+    return [
+        {
+            "name": name,
+            "description": description,
+            "start_index": start,
+            "end_index": end,
+            "start_time_s": st,
+            "end_time_s": et,
+            "duration_s": et - st,
+        }
+        for (name, description, start, end, _), st, et in zip(defs, start_times, end_times)
+    ]
+
+
+def _key_points(trial: CMJTrial, defs: List[Tuple[str, Optional[int]]]) -> List[Dict[str, Any]]:
+    """Key-point rows {name, index, time_s, value_N} for each (name, index) with an in-range index.
+
+    Times and force values for all points come from one fancy-index gather each.
+    """
+    n = trial.sample_count
+    kept = [(name, idx) for name, idx in defs if idx is not None and 0 <= idx < n]
+    if not kept:
+        return []
+    idxs = np.fromiter((idx for _, idx in kept), dtype=np.intp, count=len(kept))
+    times = trial.t[idxs].tolist()
+    values = widen_float32(trial.force[idxs]).tolist()
+    return [
+        {"name": name, "index": idx, "time_s": time_s, "value_N": value_n}
+        for (name, idx), time_s, value_n in zip(kept, times, values)
+    ]
 
 
 def build_visualization_payload(
@@ -32,101 +111,40 @@ def build_visualization_payload(
     v_zero = events.velocity_zero
     min_force = events.min_force
 
-    def _phase(start_t: float, end_t: float, **kwargs: Any) -> Dict[str, Any]:
-        d = dict(kwargs)
-        d["duration_s"] = float(end_t - start_t)
-        return d
-
     # Phases: Quiet, Eccentric (Unloading, Braking), Concentric, Flight, Landing
-    phases: List[Dict[str, Any]] = []
-    quiet_end = float(t[onset]) if onset is not None and onset < n else 0.0
-    phases.append(_phase(0.0, quiet_end, name="Quiet", description="Standing still; force represents body weight",
-        start_index=0, end_index=onset if onset is not None else 0, start_time_s=0.0, end_time_s=quiet_end))
     p1_idx = metrics.get("p1_peak_index")
     braking_end = p1_idx if p1_idx is not None else v_zero
+    quiet_end = onset if onset is not None and onset < n else 0
+    phase_defs: List[_PhaseDef] = [
+        ("Quiet", "Standing still; force represents body weight", 0, onset if onset is not None else 0, quiet_end),
+    ]
     if onset is not None:
         if min_force is not None:
-            st, et = float(t[onset]), float(t[min_force])
-            phases.append(_phase(st, et, name="Eccentric - Unloading", description="Force decreases as the body lowers",
-                start_index=onset, end_index=min_force, start_time_s=st, end_time_s=et))
+            phase_defs.append(("Eccentric - Unloading", "Force decreases as the body lowers",
+                onset, min_force, min_force))
         if min_force is not None and braking_end is not None and braking_end > min_force:
-            st, et = float(t[min_force]), float(t[braking_end])
-            phases.append(_phase(st, et, name="Eccentric - Braking", description="Force increases as individual prepares to push off",
-                start_index=min_force, end_index=braking_end, start_time_s=st, end_time_s=et))
+            phase_defs.append(("Eccentric - Braking", "Force increases as individual prepares to push off",
+                min_force, braking_end, braking_end))
         if braking_end is not None and take_off is not None and take_off >= braking_end:
-            st, et = float(t[braking_end]), float(t[take_off])
-            phases.append(_phase(st, et, name="Concentric", description="Push upwards; force increases (P1 and P2 peaks)",
-                start_index=braking_end, end_index=take_off, start_time_s=st, end_time_s=et))
+            phase_defs.append(("Concentric", "Push upwards; force increases (P1 and P2 peaks)",
+                braking_end, take_off, take_off))
         if take_off is not None and landing is not None:
-            st, et = float(t[take_off]), float(t[landing])
-            phases.append(_phase(st, et, name="Flight", description="Airborne; force plate reads zero",
-                start_index=take_off, end_index=landing, start_time_s=st, end_time_s=et))
+            phase_defs.append(("Flight", "Airborne; force plate reads zero", take_off, landing, landing))
         if landing is not None:
-            st, et = float(t[landing]), float(t[-1])
-            phases.append(_phase(st, et, name="Landing", description="Impact and absorption",
-                start_index=landing, end_index=n - 1, start_time_s=st, end_time_s=et))
+            phase_defs.append(("Landing", "Impact and absorption", landing, n - 1, n - 1))
+    phases = _phase_rows(t, phase_defs)
 
-    # Key points
-    key_points: List[Dict[str, Any]] = []
-    if onset is not None:
-        key_points.append({
-            "name": "Start of movement",
-            "index": onset,
-            "time_s": float(t[onset]),
-            "value_N": float(trial.force[onset]),
-        })
-    if min_force is not None:
-        key_points.append({
-            "name": "Minimum force (eccentric end)",
-            "index": min_force,
-            "time_s": float(t[min_force]),
-            "value_N": float(trial.force[min_force]),
-        })
-    # Max RFD kept in metrics only; not drawn on chart
-    p1_idx = metrics.get("p1_peak_index")
-    if p1_idx is not None:
-        key_points.append({
-            "name": "P1 peak",
-            "index": p1_idx,
-            "time_s": float(t[p1_idx]),
-            "value_N": float(trial.force[p1_idx]),
-        })
-    p2_idx = metrics.get("p2_peak_index")
-    if p2_idx is not None:
-        key_points.append({
-            "name": "P2 peak",
-            "index": p2_idx,
-            "time_s": float(t[p2_idx]),
-            "value_N": float(trial.force[p2_idx]),
-        })
-    if take_off is not None:
-        key_points.append({
-            "name": "Take-off",
-            "index": take_off,
-            "time_s": float(t[take_off]),
-            "value_N": float(trial.force[take_off]),
-        })
-    if landing is not None:
-        key_points.append({
-            "name": "Landing",
-            "index": landing,
-            "time_s": float(t[landing]),
-            "value_N": float(trial.force[landing]),
-        })
-
-    # Serialize metrics (convert numpy/types for JSON)
-    metrics_ser: Dict[str, Any] = {}
-    for k, v in metrics.items():
-        if v is None:
-            metrics_ser[k] = None
-        elif isinstance(v, (int, float, str, bool)):
-            metrics_ser[k] = v
-        elif isinstance(v, np.floating):
-            metrics_ser[k] = float(v)
-        elif isinstance(v, np.integer):
-            metrics_ser[k] = int(v)
-        else:
-            metrics_ser[k] = v
+    # Key points (Max RFD kept in metrics only; not drawn on chart)
+    key_points = _key_points(trial, [
+        ("Start of movement", onset),
+        ("Minimum force (eccentric end)", min_force),
+        ("P1 peak", p1_idx),
+        ("P2 peak", metrics.get("p2_peak_index")),
+        ("Take-off", take_off),
+        ("Landing", landing),
+    ])
+
+    metrics_ser = _serialize_metrics(metrics)
 
     payload = {
         "athlete_id": trial.athlete_id,
@@ -134,10 +152,10 @@ def build_visualization_payload(
         "sample_rate": trial.sample_rate,
         "bodyweight_N": bodyweight,
         "validity": {"is_valid": validity.is_valid, "flags": validity.flags},
-        "time_s": _to_list(trial.t),
-        "force_N": _to_list(trial.force),
-        "left_force_N": _to_list(trial.left_force),
-        "right_force_N": _to_list(trial.right_force),
+        "time_s": trial.t.tolist(),
+        "force_N": widen_float32(trial.force).tolist(),
+        "left_force_N": widen_float32(trial.left_force).tolist(),
+        "right_force_N": widen_float32(trial.right_force).tolist(),
         "phases": phases,
         "key_points": key_points,
         "events": {
@@ -170,44 +188,29 @@ def build_dj_visualization_payload(
     t = trial.t
     n = trial.sample_count
 
-    def _phase(start_t: float, end_t: float, **kwargs: Any) -> Dict[str, Any]:
-        d = dict(kwargs)
-        d["duration_s"] = float(end_t - start_t)
-        return d
-
     # DJ Phases: Pre-jump, Contact, Flight, Landing
-    dj_phases: List[Dict[str, Any]] = []
     contact_start = points.drop_landing
     take_off = points.take_off
     flight_land = points.flight_land
+    phase_defs: List[_PhaseDef] = []
 
     if contact_start is not None and contact_start > 0:
-        st, et = 0.0, float(t[contact_start])
-        dj_phases.append(_phase(st, et, name="Pre-jump",
-            description="Athlete on the box or in freefall before landing",
-            start_index=0, end_index=contact_start - 1, start_time_s=st, end_time_s=et))
+        phase_defs.append(("Pre-jump", "Athlete on the box or in freefall before landing",
+            0, contact_start - 1, contact_start))
 
     if contact_start is not None and take_off is not None:
-        st, et = float(t[contact_start]), float(t[take_off])
-        dj_phases.append(_phase(st, et, name="Contact",
-            description="Ground contact from drop landing through propulsion to take-off",
-            start_index=contact_start, end_index=take_off, start_time_s=st, end_time_s=et))
+        phase_defs.append(("Contact", "Ground contact from drop landing through propulsion to take-off",
+            contact_start, take_off, take_off))
 
     if take_off is not None and flight_land is not None:
-        st, et = float(t[take_off]), float(t[flight_land])
-        dj_phases.append(_phase(st, et, name="Flight",
-            description="Airborne; force plate reads near zero",
-            start_index=take_off, end_index=flight_land, start_time_s=st, end_time_s=et))
+        phase_defs.append(("Flight", "Airborne; force plate reads near zero", take_off, flight_land, flight_land))
 
     if flight_land is not None:
-        st, et = float(t[flight_land]), float(t[-1])
-        dj_phases.append(_phase(st, et, name="Landing",
-            description="Impact and absorption after reactive jump",
-            start_index=flight_land, end_index=n - 1, start_time_s=st, end_time_s=et))
+        phase_defs.append(("Landing", "Impact and absorption after reactive jump", flight_land, n - 1, n - 1))
+    dj_phases = _phase_rows(t, phase_defs)
 
     # DJ Key Points (only include non-None)
-    key_points: List[Dict[str, Any]] = []
-    _dj_kp_defs = [
+    key_points = _key_points(trial, [
         ("Drop Landing", points.drop_landing),
         ("Peak Impact Force", points.peak_impact_force),
         ("Contact Through Point", points.contact_through_point),
@@ -216,29 +219,9 @@ def build_dj_visualization_payload(
         ("Take-off", points.take_off),
         ("Flight Land", points.flight_land),
         ("Peak Landing Force", points.peak_landing_force),
-    ]
-    for kp_name, kp_idx in _dj_kp_defs:
-        if kp_idx is not None and 0 <= kp_idx < n:
-            key_points.append({
-                "name": kp_name,
-                "index": kp_idx,
-                "time_s": float(t[kp_idx]),
-                "value_N": float(trial.force[kp_idx]),
-            })
-
-    # Serialize metrics
-    metrics_ser: Dict[str, Any] = {}
-    for k, v in metrics.items():
-        if v is None:
-            metrics_ser[k] = None
-        elif isinstance(v, (int, float, str, bool)):
-            metrics_ser[k] = v
-        elif isinstance(v, np.floating):
-            metrics_ser[k] = float(v)
-        elif isinstance(v, np.integer):
-            metrics_ser[k] = int(v)
-        else:
-            metrics_ser[k] = v
+    ])
+
+    metrics_ser = _serialize_metrics(metrics)
 
     events = {**points.to_dict(), "landing": points.flight_land}
     payload = {
@@ -247,10 +230,10 @@ def build_dj_visualization_payload(
         "sample_rate": trial.sample_rate,
         "bodyweight_N": bodyweight,
         "validity": {"is_valid": validity.is_valid, "flags": validity.flags},
-        "time_s": _to_list(trial.t),
-        "force_N": _to_list(trial.force),
-        "left_force_N": _to_list(trial.left_force),
-        "right_force_N": _to_list(trial.right_force),
+        "time_s": trial.t.tolist(),
+        "force_N": widen_float32(trial.force).tolist(),
+        "left_force_N": widen_float32(trial.left_force).tolist(),
+        "right_force_N": widen_float32(trial.right_force).tolist(),
         "phases": dj_phases,
         "key_points": key_points,
         "events": events,
@@ -278,38 +261,21 @@ def build_sj_visualization_payload(
     t = trial.t
     n = trial.sample_count
 
-    def _phase(start_t: float, end_t: float, **kwargs: Any) -> Dict[str, Any]:
-        d = dict(kwargs)
-        d["duration_s"] = float(end_t - start_t)
-        return d
-
-    phases: List[Dict[str, Any]] = []
     cs = points.contraction_start
     to_idx = points.takeoff_index
     land_idx = points.landing_index
+    phase_defs: List[_PhaseDef] = []
 
     if cs is not None and cs > 0:
-        st, et = 0.0, float(t[cs])
-        phases.append(_phase(st, et, name="Quiet",
-            description="Standing still; force represents body weight",
-            start_index=0, end_index=cs - 1, start_time_s=st, end_time_s=et))
+        phase_defs.append(("Quiet", "Standing still; force represents body weight", 0, cs - 1, cs))
     if cs is not None and to_idx is not None:
-        st, et = float(t[cs]), float(t[to_idx])
-        phases.append(_phase(st, et, name="Concentric",
-            description="Concentric phase from contraction start to take-off",
-            start_index=cs, end_index=to_idx, start_time_s=st, end_time_s=et))
+        phase_defs.append(("Concentric", "Concentric phase from contraction start to take-off", cs, to_idx, to_idx))
     if to_idx is not None and land_idx is not None:
-        st, et = float(t[to_idx]), float(t[land_idx])
-        phases.append(_phase(st, et, name="Flight",
-            description="Airborne; force plate reads near zero",
-            start_index=to_idx, end_index=land_idx, start_time_s=st, end_time_s=et))
+        phase_defs.append(("Flight", "Airborne; force plate reads near zero", to_idx, land_idx, land_idx))
     if land_idx is not None:
-        st, et = float(t[land_idx]), float(t[-1])
-        phases.append(_phase(st, et, name="Landing",
-            description="Impact and absorption after landing",
-            start_index=land_idx, end_index=n - 1, start_time_s=st, end_time_s=et))
+        phase_defs.append(("Landing", "Impact and absorption after landing", land_idx, n - 1, n - 1))
+    phases = _phase_rows(t, phase_defs)
 
-    key_points: List[Dict[str, Any]] = []
     _sj_kp_defs: List[Tuple[str, Optional[int]]] = [
         ("Contraction start", points.contraction_start),
         ("Peak force", points.peak_force_index),
@@ -323,27 +289,9 @@ def build_sj_visualization_payload(
         _sj_kp_defs.append(("Trough between peaks (bimodal)", points.trough_between_peaks_index))
     if getattr(points, "second_peak_index", None) is not None:
         _sj_kp_defs.append(("Second peak (bimodal)", points.second_peak_index))
-    for kp_name, kp_idx in _sj_kp_defs:
-        if kp_idx is not None and 0 <= kp_idx < n:
-            key_points.append({
-                "name": kp_name,
-                "index": kp_idx,
-                "time_s": float(t[kp_idx]),
-                "value_N": float(trial.force[kp_idx]),
-            })
-
-    metrics_ser: Dict[str, Any] = {}
-    for k, v in metrics.items():
-        if v is None:
-            metrics_ser[k] = None
-        elif isinstance(v, (int, float, str, bool)):
-            metrics_ser[k] = v
-        elif isinstance(v, np.floating):
-            metrics_ser[k] = float(v)
-        elif isinstance(v, np.integer):
-            metrics_ser[k] = int(v)
-        else:
-            metrics_ser[k] = v
+    key_points = _key_points(trial, _sj_kp_defs)
+
+    metrics_ser = _serialize_metrics(metrics)
     metrics_ser["sj_classification"] = classification
 
     payload = {
@@ -352,10 +300,10 @@ def build_sj_visualization_payload(
         "sample_rate": trial.sample_rate,
         "bodyweight_N": bodyweight,
         "validity": {"is_valid": validity.is_valid, "flags": validity.flags},
-        "time_s": _to_list(trial.t),
-        "force_N": _to_list(trial.force),
-        "left_force_N": _to_list(trial.left_force),
-        "right_force_N": _to_list(trial.right_force),
+        "time_s": trial.t.tolist(),
+        "force_N": widen_float32(trial.force).tolist(),
+        "left_force_N": widen_float32(trial.left_force).tolist(),
+        "right_force_N": widen_float32(trial.right_force).tolist(),
         "phases": phases,
         "key_points": key_points,
         "events": {
@@ -379,12 +327,94 @@ def build_sj_visualization_payload(
     return payload
 
 
+# Per-sample arrays packed by pack_payload_arrays, with their wire dtype. Forces are stored
+# as float32 already; trial.t is float64, so time_s keeps the same values as the
+# phase/key-point times read from it.
+PACKED_ARRAY_DTYPES = {
+    "time_s": "float64",
+    "force_N": "float32",
+    "left_force_N": "float32",
+    "right_force_N": "float32",
+}
+
+
+def _pack_array(values: Any, dtype: str) -> Dict[str, Any]:
+    """Encode a float array as {"dtype": dtype, "length": n, "b64": <little-endian bytes>}."""
+    arr = np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder("<"))
+    return {
+        "dtype": dtype,
+        "length": int(arr.size),
+        "b64": base64.b64encode(arr.tobytes()).decode("ascii"),
+    }
+
+
+# Record lists written column-wise by pack_payload_arrays
+COLUMNAR_RECORD_KEYS = ("phases", "key_points")
+
+
+def _to_columns(rows: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """[{k: v, ...}, ...] -> {k: [v, ...], ...}; keys in first-seen order, None where a row lacks one."""
+    keys: Dict[str, None] = {}
+    for row in rows:
+        keys.update(dict.fromkeys(row))
+    return {k: [row.get(k) for row in rows] for k in keys}
+
+
+def pack_payload_arrays(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a shallow copy of payload in the compact file layout.
+
+    Per-sample arrays are base64-packed (a fraction of the size of JSON number lists,
+    with no per-float text formatting on write or parsing on load), and the phases /
+    key_points record lists become column objects so field names are not repeated per
+    row. The viewer decodes either layout.
+    """
+    packed = dict(payload)
+    for key, dtype in PACKED_ARRAY_DTYPES.items():
+        if isinstance(packed.get(key), (list, tuple, np.ndarray)):
+            packed[key] = _pack_array(packed[key], dtype)
+    for key in COLUMNAR_RECORD_KEYS:
+        if isinstance(packed.get(key), list):
+            packed[key] = _to_columns(packed[key])
+    return packed
+
+
+def _json_default(obj: Any) -> Any:
+    """Fallback for values the encoder does not handle natively (numpy arrays/scalars)."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
 def export_visualization_json(
     payload: Dict[str, Any],
     path: Path,
+    pack_arrays: bool = True,
+    *,
+    pretty: bool = False,
 ) -> None:
-    """Write the visualization payload to a JSON file."""
+    """Write the visualization payload to a JSON file.
+
+    pack_arrays writes time_s and the force arrays as base64 binary buffers and
+    phases / key_points as columns (see pack_payload_arrays); pass False for the
+    same layout run_analysis returns. Output is compact unless pretty=True, which
+    indents by 2 for reading by hand. With orjson available the whole document is
+    encoded in native code (numpy arrays and scalars included) and written in one
+    call; otherwise stdlib json is used.
+    """
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
+    if pack_arrays:
+        payload = pack_payload_arrays(payload)
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        path.write_bytes(orjson.dumps(payload, default=_json_default, option=option))
+        return
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2)
+        if pretty:
+            json.dump(payload, f, indent=2, default=_json_default)
+        else:
+            json.dump(payload, f, separators=(",", ":"), default=_json_default)
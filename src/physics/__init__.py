@@ -1,5 +1,6 @@
 from .kinematics import compute_kinematics
 from .metrics import compute_metrics
 from .asymmetry import compute_asymmetry
+from .rfd import compute_rfd_batch
 
-__all__ = ["compute_kinematics", "compute_metrics", "compute_asymmetry"]
+__all__ = ["compute_kinematics", "compute_metrics", "compute_asymmetry", "compute_rfd_batch"]
@@ -0,0 +1,29 @@
+"""Trapezoidal integration for uniformly sampled signals (fixed dt, no time vector)."""
+from typing import Optional
+
+import numpy as np
+
+
+def uniform_trapz(y: np.ndarray, dt: float) -> float:
+    """Trapezoid integral of y with constant step dt: dt * (sum(y) - (y[0] + y[-1]) / 2).
+
+    Accumulates in float64, so float32 force slices lose nothing to the sum.
+    Returns 0.0 for an empty input, like scipy's trapezoid.
+    """
+    if len(y) == 0:
+        return 0.0
+    s = float(np.sum(y, dtype=np.float64))
+    return dt * (s - 0.5 * (float(y[0]) + float(y[-1])))
+
+
+def uniform_cumtrapz(y: np.ndarray, dt: float, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Running trapezoid integral of y with constant step dt, starting at 0 (initial=0).
+
+    c[i] = dt * (y[0] + ... + y[i] - (y[0] + y[i]) / 2); float64 output, same length as y.
+    If out (float64, len(y)) is given the result is written there and out is returned.
+    """
+    c = np.cumsum(y, dtype=np.float64, out=out)
+    if c.size:
+        c -= 0.5 * (float(y[0]) + np.asarray(y, dtype=np.float64))
+        c *= dt
+    return c
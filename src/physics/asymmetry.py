@@ -2,13 +2,10 @@
 from typing import Dict, Any, Optional
 
 import numpy as np
-from scipy.integrate import trapezoid
-from scipy.signal import savgol_filter
 
 from ..data.types import CMJTrial, CMJEvents
-
-RFD_SAVGOL_WINDOW_MS = 20.0
-RFD_SAVGOL_POLY = 3
+from ._integrate import uniform_trapz
+from .rfd import RFD_SAVGOL_POLY, RFD_SAVGOL_WINDOW_MS, rfd_signal
 
 
 def _asymmetry_index(left: float, right: float) -> Optional[float]:
@@ -19,24 +16,17 @@ def _asymmetry_index(left: float, right: float) -> Optional[float]:
     return float(2.0 * (left - right) / s * 100.0)
 
 
-def _rfd_signal(force: np.ndarray, sr: float, window_ms: float, poly: int) -> np.ndarray:
-    dt = 1.0 / sr
-    w = max(3, int(sr * window_ms / 1000.0) | 1)
-    if w > len(force):
-        w = len(force) if len(force) % 2 else max(1, len(force) - 1)
-    if poly >= w:
-        poly = max(1, w - 1)
-    f_smooth = savgol_filter(force.astype(float), window_length=w, polyorder=poly, mode="nearest")
-    return np.gradient(f_smooth, dt)
-
-
 def compute_asymmetry(
     trial: CMJTrial,
     events: CMJEvents,
     rfd_savgol_window_ms: float = RFD_SAVGOL_WINDOW_MS,
     rfd_savgol_poly: int = RFD_SAVGOL_POLY,
+    rfd_batch: Optional[np.ndarray] = None,
 ) -> Dict[str, Any]:
-    """Compute left/right asymmetry metrics. Returns empty dict if L/R not usable."""
+    """Compute left/right asymmetry metrics. Returns empty dict if L/R not usable.
+
+    rfd_batch: optional output of compute_rfd_batch (rows 1 and 2 are the left/right RFD).
+    """
     out: Dict[str, Any] = {}
     left_f = trial.left_force
     right_f = trial.right_force
@@ -47,8 +37,8 @@ def compute_asymmetry(
     take_off = events.take_off
     v_zero = events.velocity_zero
     min_force = events.min_force
-    t = trial.t
     sr = trial.sample_rate
+    dt = 1.0 / sr
 
     if onset is None or take_off is None:
         return out
@@ -65,8 +55,8 @@ def compute_asymmetry(
     # Concentric impulse asymmetry
     if v_zero is not None:
         sl = slice(v_zero, take_off + 1)
-        J_L = trapezoid(left_f[sl], t[sl])
-        J_R = trapezoid(right_f[sl], t[sl])
+        J_L = uniform_trapz(left_f[sl], dt)
+        J_R = uniform_trapz(right_f[sl], dt)
         out["concentric_impulse_asymmetry_pct"] = _asymmetry_index(J_L, J_R)
     else:
         out["concentric_impulse_asymmetry_pct"] = None
@@ -74,15 +64,19 @@ def compute_asymmetry(
     # Eccentric impulse asymmetry (onset to min_force)
     if min_force is not None:
         sl = slice(onset, min_force + 1)
-        J_L = trapezoid(left_f[sl], t[sl])
-        J_R = trapezoid(right_f[sl], t[sl])
+        J_L = uniform_trapz(left_f[sl], dt)
+        J_R = uniform_trapz(right_f[sl], dt)
         out["eccentric_impulse_asymmetry_pct"] = _asymmetry_index(J_L, J_R)
     else:
         out["eccentric_impulse_asymmetry_pct"] = None
 
     # RFD asymmetry: peak RFD left vs right over contact
-    rfd_L = _rfd_signal(left_f, sr, rfd_savgol_window_ms, rfd_savgol_poly)
-    rfd_R = _rfd_signal(right_f, sr, rfd_savgol_window_ms, rfd_savgol_poly)
+    if rfd_batch is not None:
+        rfd_L, rfd_R = rfd_batch[1], rfd_batch[2]
+    else:
+        rfd_L, rfd_R = rfd_signal(
+            np.stack([left_f, right_f]).astype(np.float64), sr, rfd_savgol_window_ms, rfd_savgol_poly
+        )
     sl = slice(onset, take_off + 1)
     peak_rfd_L = float(np.max(rfd_L[sl]))
     peak_rfd_R = float(np.max(rfd_R[sl]))
@@ -1,8 +1,8 @@
 """Acceleration and velocity from force (COM kinematics), with drift correction."""
 import numpy as np
-from scipy.integrate import cumulative_trapezoid, trapezoid
 
 from ..data.types import CMJTrial
+from ._integrate import uniform_cumtrapz, uniform_trapz
 
 G = 9.81
 
@@ -24,10 +24,11 @@ def compute_kinematics(
     """
     mass = bodyweight / G
     force = trial.force
-    t = trial.t
+    dt = 1.0 / trial.sample_rate
     n = trial.sample_count
 
-    a = (force - bodyweight) / mass
+    net = np.subtract(force, bodyweight, dtype=np.float64)
+    a = net / mass
 
     if onset_idx is None or take_off_idx is None:
         return np.zeros(n), a
@@ -37,23 +38,21 @@ def compute_kinematics(
         v = np.zeros(n)
         return v, a
 
-    t_seg = t[start:end]
-    a_seg = a[start:end]
-    f_seg = force[start:end]
-    if len(t_seg) > 1:
-        v_seg = cumulative_trapezoid(a_seg, t_seg, initial=0)
-    else:
-        v_seg = np.zeros_like(t_seg)
+    # Integrate straight into v's segment and correct it in place: no per-segment copies
+    v = np.zeros(n)
+    v_seg = v[start:end]
+    m_seg = end - start
+    if m_seg > 1:
+        uniform_cumtrapz(a[start:end], dt, out=v_seg)
 
     # Drift correction: enforce v(take_off) = J/m
-    J = trapezoid(f_seg - bodyweight, t_seg)
+    J = uniform_trapz(net[start:end], dt)
     v_to_expected = J / mass
     v_to_integrated = float(v_seg[-1])
-    dt_seg = t_seg[-1] - t_seg[0]
-    if dt_seg > 0:
-        ramp = (v_to_expected - v_to_integrated) * (t_seg - t_seg[0]) / dt_seg
-        v_seg = v_seg + ramp
-
-    v = np.zeros(n)
-    v[start:end] = v_seg
+    if m_seg > 1:
+        # Linear in time; with uniform sampling that is linear in sample offset
+        ramp = np.arange(m_seg, dtype=np.float64)
+        ramp /= m_seg - 1
+        ramp *= v_to_expected - v_to_integrated
+        v_seg += ramp
     return v, a
@@ -2,29 +2,14 @@
 from typing import Dict, Any, Optional
 
 import numpy as np
-from scipy.integrate import trapezoid, cumulative_trapezoid
-from scipy.signal import savgol_filter
 
 from ..config import DEFAULT_CONFIG
-from ..data.types import CMJTrial, CMJEvents
+from ..data.types import CMJTrial, CMJEvents, widen_float32
 from ..detect.structural_peaks import detect_peaks_smoothed_then_match
+from ._integrate import uniform_cumtrapz, uniform_trapz
+from .rfd import RFD_SAVGOL_POLY, RFD_SAVGOL_WINDOW_MS, rfd_signal
 
 G = 9.81
-RFD_SAVGOL_WINDOW_MS = 20.0
-RFD_SAVGOL_POLY = 3
-
-
-def _smooth_rfd(force: np.ndarray, t: np.ndarray, window_ms: float, poly: int, sr: float):
-    """Savitzky-Golay smoothed force and its derivative (RFD)."""
-    dt = 1.0 / sr
-    w = max(3, int(sr * window_ms / 1000.0) | 1)
-    if w > len(force):
-        w = len(force) if len(force) % 2 else max(1, len(force) - 1)
-    if poly >= w:
-        poly = max(1, w - 1)
-    f_smooth = savgol_filter(force.astype(float), window_length=w, polyorder=poly, mode="nearest")
-    rfd = np.gradient(f_smooth, dt)
-    return rfd
 
 
 def compute_metrics(
@@ -34,17 +19,21 @@ def compute_metrics(
     velocity: np.ndarray,
     rfd_savgol_window_ms: float = RFD_SAVGOL_WINDOW_MS,
     rfd_savgol_poly: int = RFD_SAVGOL_POLY,
+    rfd_batch: Optional[np.ndarray] = None,
 ) -> Dict[str, Any]:
     """Compute all CMJ metrics including phase impulses, displacement, RSImod, RFD.
 
     Phase boundaries: unweighting = onset -> min_force; braking = min_force -> P1 (or v_zero);
-    propulsion = P1 (or v_zero) -> take_off.
+    propulsion = P1 (or v_zero) -> take_off. rfd_batch: optional output of compute_rfd_batch
+    (row 0 is used as the total-force RFD instead of recomputing it).
     """
     mass = bodyweight / G
     force = trial.force
     t = trial.t
     sr = trial.sample_rate
     dt = 1.0 / sr
+    # Net force in float64, built once; every phase impulse below integrates a view of it
+    net = np.subtract(force, bodyweight, dtype=np.float64)
 
     onset = events.movement_onset
     take_off = events.take_off
@@ -57,7 +46,7 @@ def compute_metrics(
 
     # Take-off velocity and jump height (impulse-momentum)
     if onset is not None and take_off is not None:
-        impulse = trapezoid(force[onset : take_off + 1] - bodyweight, t[onset : take_off + 1])
+        impulse = uniform_trapz(net[onset : take_off + 1], dt)
         v_to = impulse / mass
         out["take_off_velocity_m_s"] = float(v_to)
         out["jump_height_impulse_m"] = float((v_to ** 2) / (2 * G))
@@ -87,11 +76,15 @@ def compute_metrics(
         out["peak_power_W"] = None
 
     # RFD: Savitzky-Golay
-    rfd = _smooth_rfd(force, t, rfd_savgol_window_ms, rfd_savgol_poly, sr)
+    if rfd_batch is not None:
+        rfd = rfd_batch[0]
+    else:
+        rfd = rfd_signal(force.astype(np.float64), sr, rfd_savgol_window_ms, rfd_savgol_poly)
     if onset is not None and take_off is not None:
         rfd_contact = rfd[onset : take_off + 1]
-        out["peak_rfd_N_per_s"] = float(np.max(rfd_contact))
+        # One argmax pass gives both the peak and its index (argmax lands on NaN like np.max)
         max_rfd_idx_rel = int(np.argmax(rfd_contact))
+        out["peak_rfd_N_per_s"] = float(rfd_contact[max_rfd_idx_rel])
         out["max_rfd_index"] = onset + max_rfd_idx_rel
         out["max_rfd_time_s"] = float(t[out["max_rfd_index"]])
         # 0-100 ms and 0-200 ms from onset
@@ -118,7 +111,7 @@ def compute_metrics(
 
     # Phase impulses and times: unweighting = onset -> min_force; braking/propulsion use P1 when available
     if min_force is not None and onset is not None:
-        unweighting_impulse = trapezoid(force[onset : min_force + 1] - bodyweight, t[onset : min_force + 1])
+        unweighting_impulse = uniform_trapz(net[onset : min_force + 1], dt)
         out["unweighting_impulse_Ns"] = float(unweighting_impulse)
         out["unweighting_time_s"] = float((min_force - onset) * dt)
     else:
@@ -139,8 +132,8 @@ def compute_metrics(
     # Peak/mean concentric force (window: velocity_zero to take_off)
     if v_zero is not None and take_off is not None:
         f_conc = force[v_zero : take_off + 1]
-        out["peak_concentric_force_N"] = float(np.max(f_conc))
-        out["mean_concentric_force_N"] = float(np.mean(f_conc))
+        out["peak_concentric_force_N"] = float(widen_float32(np.max(f_conc)))
+        out["mean_concentric_force_N"] = float(np.mean(f_conc, dtype=np.float64))
     else:
         out["peak_concentric_force_N"] = None
         out["mean_concentric_force_N"] = None
@@ -165,12 +158,12 @@ def compute_metrics(
             second_idx = max(idx_a, idx_b)
             out["p1_peak_index"] = first_idx
             out["p2_peak_index"] = second_idx
-            out["p1_peak_N"] = float(force[first_idx])
-            out["p2_peak_N"] = float(force[second_idx])
+            out["p1_peak_N"] = float(widen_float32(force[first_idx]))
+            out["p2_peak_N"] = float(widen_float32(force[second_idx]))
         elif idx_a is not None:
             out["p1_peak_index"] = idx_a
             out["p2_peak_index"] = None
-            out["p1_peak_N"] = float(force[idx_a])
+            out["p1_peak_N"] = float(widen_float32(force[idx_a]))
             out["p2_peak_N"] = None
         else:
             out["p1_peak_index"] = None
@@ -183,7 +176,7 @@ def compute_metrics(
         out["p1_peak_N"] = None
         out["p2_peak_N"] = None
     if min_force is not None:
-        out["min_force_N"] = float(force[min_force])
+        out["min_force_N"] = float(widen_float32(force[min_force]))
     else:
         out["min_force_N"] = None
 
@@ -191,24 +184,23 @@ def compute_metrics(
     p1_idx = out.get("p1_peak_index")
     braking_end = p1_idx if p1_idx is not None else v_zero
     if min_force is not None and braking_end is not None and braking_end >= min_force:
-        braking_impulse = trapezoid(force[min_force : braking_end + 1] - bodyweight, t[min_force : braking_end + 1])
+        braking_impulse = uniform_trapz(net[min_force : braking_end + 1], dt)
         out["braking_impulse_Ns"] = float(braking_impulse)
     else:
         out["braking_impulse_Ns"] = None
     if take_off is not None and braking_end is not None and braking_end <= take_off:
-        propulsion_impulse = trapezoid(force[braking_end : take_off + 1] - bodyweight, t[braking_end : take_off + 1])
+        propulsion_impulse = uniform_trapz(net[braking_end : take_off + 1], dt)
         out["propulsion_impulse_Ns"] = float(propulsion_impulse)
         out["concentric_time_s"] = float((take_off - braking_end) * dt)
     else:
         out["propulsion_impulse_Ns"] = None
         out["concentric_time_s"] = None
 
-    # COM displacement from onset: s = cumulative_trapezoid(v, t)
+    # COM displacement from onset: s = cumulative trapezoid of v
     if onset is not None and take_off is not None and take_off >= onset:
         v_seg = velocity[onset : take_off + 1]
-        t_seg = t[onset : take_off + 1]
         if len(v_seg) > 1:
-            s_seg = cumulative_trapezoid(v_seg, t_seg, initial=0)
+            s_seg = uniform_cumtrapz(v_seg, dt)
             out["countermovement_depth_m"] = float(np.min(s_seg))
             out["com_displacement_at_takeoff_m"] = float(s_seg[-1])
         else:
@@ -0,0 +1,55 @@
+"""Rate of force development: Savitzky-Golay smoothed force derivative."""
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+
+from ..data.types import CMJTrial
+from ..signal import savgol_smooth
+
+RFD_SAVGOL_WINDOW_MS = 20.0
+RFD_SAVGOL_POLY = 3
+
+
+@lru_cache(maxsize=64)
+def resolve_savgol_window(n: int, sr: float, window_ms: float, poly: int) -> Tuple[int, int]:
+    """(window_length, polyorder) for a window_ms filter on n samples at sr Hz.
+
+    The window is odd, at least 3 and at most n; poly is lowered below the window if needed.
+    Depends only on the trial length and sample rate, so it is resolved once per setting.
+    """
+    w = max(3, int(sr * window_ms / 1000.0) | 1)
+    if w > n:
+        w = n if n % 2 else max(1, n - 1)
+    if poly >= w:
+        poly = max(1, w - 1)
+    return w, poly
+
+
+def rfd_signal(
+    force: np.ndarray,
+    sr: float,
+    window_ms: float = RFD_SAVGOL_WINDOW_MS,
+    poly: int = RFD_SAVGOL_POLY,
+) -> np.ndarray:
+    """RFD (N/s) of force along its last axis: SG smoothing, then np.gradient.
+
+    force may be 1-D or a (k, N) stack of signals sharing one sample rate.
+    """
+    w, poly = resolve_savgol_window(force.shape[-1], float(sr), float(window_ms), int(poly))
+    f_smooth = savgol_smooth(force, w, poly, axis=-1)
+    return np.gradient(f_smooth, 1.0 / sr, axis=-1)
+
+
+def compute_rfd_batch(
+    trial: CMJTrial,
+    window_ms: float = RFD_SAVGOL_WINDOW_MS,
+    poly: int = RFD_SAVGOL_POLY,
+) -> np.ndarray:
+    """RFD of total, left and right force as one (3, N) array, rows in that order.
+
+    The three signals are filtered as one contiguous stack in a single pass; pass the
+    result to compute_metrics and compute_asymmetry so neither re-smooths its inputs.
+    """
+    stack = np.stack([trial.force, trial.left_force, trial.right_force]).astype(np.float64)
+    return rfd_signal(stack, trial.sample_rate, window_ms, poly)
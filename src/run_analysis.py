@@ -23,7 +23,7 @@ from .export_viz import (
     build_sj_visualization_payload,
     build_dj_visualization_payload,
 )
-from .physics import compute_asymmetry, compute_kinematics, compute_metrics
+from .physics import compute_asymmetry, compute_kinematics, compute_metrics, compute_rfd_batch
 
 
 def run_analysis(data: Dict[str, Any]) -> Dict[str, Any]:
@@ -94,8 +94,9 @@ def run_analysis(data: Dict[str, Any]) -> Dict[str, Any]:
     )
     events = compute_phases(trial, events, v)
     validity = validate_trial(trial, events, bodyweight=bw)
-    metrics = compute_metrics(trial, events, bodyweight=bw, velocity=v)
-    asym = compute_asymmetry(trial, events)
+    rfd_batch = compute_rfd_batch(trial)
+    metrics = compute_metrics(trial, events, bodyweight=bw, velocity=v, rfd_batch=rfd_batch)
+    asym = compute_asymmetry(trial, events, rfd_batch=rfd_batch)
     for k, val in asym.items():
         metrics[k] = val
     payload = build_visualization_payload(trial, events, bw, metrics, validity)
@@ -1,3 +1,4 @@
 from .filter import lowpass_filter
+from .savgol import savgol_smooth
 
-__all__ = ["lowpass_filter"]
+__all__ = ["lowpass_filter", "savgol_smooth"]
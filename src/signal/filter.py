@@ -1,6 +1,14 @@
 """Low-pass filter for force signal (e.g. before event detection)."""
+from functools import lru_cache
+
 import numpy as np
-from scipy.signal import butter, filtfilt
+
+
+@lru_cache(maxsize=16)
+def _lowpass_sos(order: int, normal_cutoff: float) -> np.ndarray:
+    """Butterworth low-pass second-order sections (shared by every call; do not modify)."""
+    from scipy.signal import butter
+    return butter(order, normal_cutoff, btype="low", analog=False, output="sos")
 
 
 def lowpass_filter(signal: np.ndarray, sample_rate: float, cutoff_hz: float, order: int = 4) -> np.ndarray:
@@ -13,11 +21,18 @@ def lowpass_filter(signal: np.ndarray, sample_rate: float, cutoff_hz: float, ord
         order: Butterworth order (default 4).
 
     Returns:
-        Filtered signal, same shape as input.
+        Filtered signal, same shape as input. Floating input keeps its dtype (float32 stays
+        float32); any other dtype (e.g. integer counts) comes back as float64. A cutoff at or
+        above Nyquist filters nothing and returns floating input itself, not a copy.
     """
+    from scipy.signal import sosfiltfilt
+    # Integer input would be truncated if cast back, so only floating dtypes are kept
+    out_dtype = signal.dtype if np.issubdtype(signal.dtype, np.floating) else np.float64
     nyq = 0.5 * sample_rate
     normal_cutoff = cutoff_hz / nyq
     if normal_cutoff >= 1.0:
-        return signal.copy()
-    b, a = butter(order, normal_cutoff, btype="low", analog=False)
-    return filtfilt(b, a, signal.astype(float))
+        return signal.astype(out_dtype, copy=False)
+    # Second-order sections: numerically stable at high orders / low cutoffs, unlike (b, a).
+    # Coefficients depend only on (order, cutoff / nyquist), so they are designed once per setting.
+    sos = _lowpass_sos(int(order), float(normal_cutoff))
+    return sosfiltfilt(sos, signal).astype(out_dtype, copy=False)
@@ -0,0 +1,32 @@
+"""Savitzky-Golay smoothing with cached filter coefficients."""
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=32)
+def _savgol_kernel(window_length: int, polyorder: int, deriv: int, delta: float) -> np.ndarray:
+    """Convolution coefficients for one (window, order, deriv, delta); read-only since it is shared."""
+    from scipy.signal import savgol_coeffs
+    coeffs = savgol_coeffs(window_length, polyorder, deriv=deriv, delta=delta)
+    coeffs.setflags(write=False)
+    return coeffs
+
+
+def savgol_smooth(
+    x: np.ndarray,
+    window_length: int,
+    polyorder: int,
+    deriv: int = 0,
+    delta: float = 1.0,
+    axis: int = -1,
+) -> np.ndarray:
+    """Same result as savgol_filter(x, window_length, polyorder, deriv, delta, axis, mode="nearest").
+
+    The least-squares coefficients depend only on the window parameters, which are
+    fixed per sample rate, so they are computed once and reused for every signal.
+    A 2-D x filters every row (axis=-1) in one call. Output is float64.
+    """
+    from scipy.ndimage import convolve1d
+    coeffs = _savgol_kernel(int(window_length), int(polyorder), int(deriv), float(delta))
+    return convolve1d(np.asarray(x, dtype=np.float64), coeffs, axis=axis, mode="nearest")
@@ -1,4 +1,8 @@
-"""Single chart: total, left, and right force vs time; optional event lines."""
+"""Single chart: total, left, and right force vs time; optional event lines.
+
+matplotlib is imported inside plot_force only: nothing on the run_analysis path imports
+this module, and a module-level import would add its cold-start cost to every process.
+"""
 from pathlib import Path
 from typing import Optional
 
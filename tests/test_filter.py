@@ -0,0 +1,18 @@
+"""Low-pass filter output dtype."""
+import numpy as np
+
+from src.signal import lowpass_filter
+
+
+def test_integer_input_is_filtered_as_float64():
+    x = np.tile(np.array([0, 1000, 0, 1000, 5, 7], dtype=np.int32), 50)
+    y = lowpass_filter(x, 1000.0, 50.0)
+    assert y.dtype == np.float64
+    assert np.allclose(y, lowpass_filter(x.astype(np.float64), 1000.0, 50.0))
+    assert lowpass_filter(x, 1000.0, 600.0).dtype == np.float64
+
+
+def test_float32_input_stays_float32():
+    x = np.linspace(0.0, 1.0, 300, dtype=np.float32)
+    assert lowpass_filter(x, 1000.0, 50.0).dtype == np.float32
+    assert lowpass_filter(x, 1000.0, 600.0) is x
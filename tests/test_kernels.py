@@ -0,0 +1,82 @@
+"""Detection kernels: NaN handling matches the per-sample loops they replaced."""
+import numpy as np
+
+from src.data.types import CMJTrial
+from src.detect._kernels import (
+    first_crossing_sustained_below,
+    first_sustained_below,
+    first_sustained_in_range,
+)
+from src.detect.drop_jump import first_crossing_above
+from src.detect.events import detect_events
+
+
+def _cmj_force(bodyweight: float = 700.0) -> np.ndarray:
+    """Quiet stance, unweighting, propulsion, flight and landing at 1000 Hz (take-off at 1500)."""
+    f = np.full(2500, bodyweight)
+    f[1000:1200] = 400.0
+    f[1200:1500] = 1400.0
+    f[1500:1800] = 0.0
+    f[1800:] = np.linspace(2500.0, bodyweight, 700)
+    return f
+
+
+def _trial(force: np.ndarray) -> CMJTrial:
+    n = len(force)
+    return CMJTrial(
+        athlete_id="test",
+        test_type="CMJ",
+        test_duration=n / 1000.0,
+        sample_count=n,
+        force=force,
+        left_force=force / 2,
+        right_force=force / 2,
+        sample_rate=1000.0,
+    )
+
+
+def test_take_off_window_tolerates_nan():
+    x = np.array([100.0, 100.0, 10.0, np.nan, 10.0, 10.0, 10.0, 100.0])
+    assert first_crossing_sustained_below(x, 20.0, 4) == 2
+
+
+def test_take_off_window_rejects_sample_at_threshold():
+    x = np.array([100.0, 100.0, 10.0, 10.0, 20.0, 10.0, 10.0, 100.0])
+    assert first_crossing_sustained_below(x, 20.0, 4) is None
+
+
+def test_nan_dropout_after_take_off_keeps_events():
+    bodyweight = 700.0
+    clean = detect_events(_trial(_cmj_force(bodyweight)), bodyweight, sigma_quiet=5.0)
+    force = _cmj_force(bodyweight)
+    force[1503] = np.nan
+    events = detect_events(_trial(force), bodyweight, sigma_quiet=5.0)
+    assert clean.take_off == 1500
+    assert (events.movement_onset, events.take_off, events.landing, events.min_force) == (
+        clean.movement_onset,
+        clean.take_off,
+        clean.landing,
+        clean.min_force,
+    )
+
+
+def test_sustained_window_tolerates_nan():
+    x = np.zeros(40)
+    x[20:30] = 100.0
+    x[22] = np.nan
+    assert first_sustained_in_range(x, 50.0, 0, 39, 5, above=True) == 20
+    assert first_crossing_above(x, 50.0, 0, 39, 5) == 20
+    assert first_sustained_in_range(-x, -50.0, 0, 39, 5, above=False) == 20
+
+
+def test_sustained_window_cannot_start_on_nan():
+    x = np.zeros(40)
+    x[20:30] = 100.0
+    x[20] = np.nan
+    assert first_sustained_in_range(x, 50.0, 0, 39, 5, above=True) == 21
+    assert first_sustained_in_range(-x, -50.0, 0, 39, 5, above=False) == 21
+
+
+def test_sustained_below_counts_nan_as_below():
+    x = np.array([5.0, np.nan, 0.0, 0.0, 5.0])
+    assert first_sustained_below(x, 1.0, 3) == 1
@@ -0,0 +1,30 @@
+"""Loader: the streaming (ijson) and in-memory paths build the same trial."""
+import json
+
+import numpy as np
+import pytest
+
+from src.data import load as load_module
+from src.data import load_trial
+
+
+def test_streaming_loader_keeps_null_samples(tmp_path, monkeypatch):
+    pytest.importorskip("ijson")
+    path = tmp_path / "trial.json"
+    path.write_text(json.dumps({
+        "athlete_id": "test",
+        "test_type": "CMJ",
+        "test_duration": 0.005,
+        "force": [1.0, None, 3.0, 4.0, 5.0],
+        "left_force": [0.5, 1.0, None, 2.0, 2.5],
+        "right_force": [0.5, 1.0, 1.5, 2.0, None],
+    }))
+
+    in_memory = load_trial(path)
+    monkeypatch.setattr(load_module, "STREAM_THRESHOLD_BYTES", 0)
+    streamed = load_trial(path)
+
+    assert streamed.sample_count == in_memory.sample_count == 5
+    for key in ("force", "left_force", "right_force"):
+        np.testing.assert_array_equal(getattr(streamed, key), getattr(in_memory, key))
+    assert np.isnan(streamed.force[1])